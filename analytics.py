@@ -0,0 +1,165 @@
+"""Practice analytics over the whole session log, computed with NumPy.
+
+numpy is optional: the app only imports this module when the Statistics tab
+is opened, and available() tells it whether the tab can be filled in.
+"""
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DAY = 86400
+# Day 0 of the epoch (1970-01-01) was a Thursday; shifting by 3 makes weeks
+# start on Monday
+WEEK_SHIFT = 3
+ROLLING_WINDOWS = (7, 30)
+
+
+def available():
+    return np is not None
+
+
+def local_seconds(when):
+    """Naive local datetime as seconds since 1970-01-01 00:00 local time.
+
+    Log timestamps are naive local times, so all day and hour arithmetic
+    stays in this frame and never crosses a timezone conversion.
+    """
+    return int((when - datetime(1970, 1, 1)).total_seconds())
+
+
+def day_to_date(day):
+    return date(1970, 1, 1) + timedelta(days=int(day))
+
+
+def parse_starts(rows):
+    """Session starts as an int64 array of local seconds"""
+    return np.array([row[0] for row in rows], dtype='datetime64[s]').astype(np.int64)
+
+
+def model_columns(starts, durations):
+    """SessionModel columns as int64 arrays, leaving out sessions whose
+    start didn't parse"""
+    starts = np.frombuffer(starts, dtype=np.int64) if len(starts) else np.zeros(0, dtype=np.int64)
+    durations = np.frombuffer(durations, dtype=np.int32) if len(durations) else np.zeros(0, dtype=np.int32)
+    valid = starts != np.iinfo(np.int64).min  # Timestamps that didn't parse
+    return starts[valid], durations[valid].astype(np.int64)
+
+
+def runs(mask):
+    """(start, length) arrays of the runs of True in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def rolling_mean(values, window):
+    """Trailing mean over `window` days; days before the first count as zero"""
+    sums = np.cumsum(np.concatenate((np.zeros(window), values)))
+    return (sums[window:] - sums[:-window]) / window
+
+
+class PracticeAnalytics:
+    """Session starts and durations as columns, plus cached rollups.
+
+    Fed with the same replace()/extend() calls as SessionModel. summary()
+    recomputes only when sessions were added or the day changed, so
+    switching to the Statistics tab is instant after the first time.
+    """
+
+    def __init__(self, rows=()):
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.durations = np.zeros(0, dtype=np.int64)
+        self.cache = None
+        self.cache_key = None
+        self.replace(rows)
+
+    @classmethod
+    def from_columns(cls, starts, durations):
+        """Builds from SessionModel columns (array('q') local epoch seconds
+        and array('i') durations) without parsing anything"""
+        analytics = cls()
+        analytics.starts, analytics.durations = model_columns(starts, durations)
+        return analytics
+
+    def extend_columns(self, starts, durations):
+        """extend() with SessionModel columns of the added sessions"""
+        starts, durations = model_columns(starts, durations)
+        if len(starts):
+            self.starts = np.concatenate((self.starts, starts))
+            self.durations = np.concatenate((self.durations, durations))
+            self.cache = None
+
+    def replace(self, rows):
+        rows = list(rows)
+        self.starts = parse_starts(rows)
+        self.durations = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+        self.cache = None
+
+    def extend(self, rows):
+        rows = list(rows)
+        if rows:
+            self.starts = np.concatenate((self.starts, parse_starts(rows)))
+            self.durations = np.concatenate(
+                (self.durations, np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows)))
+            )
+            self.cache = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def summary(self, now=None):
+        today = local_seconds(now or datetime.now()) // DAY
+        if self.cache is None or self.cache_key != today:
+            self.cache = self._compute(today)
+            self.cache_key = today
+        return self.cache
+
+    def _compute(self, today):
+        if len(self.starts) == 0:
+            return None
+
+        days = self.starts // DAY
+        first_day = int(days.min())
+        last_day = max(today, int(days.max()))
+
+        # Per-day totals from the first session through today
+        daily = np.bincount(days - first_day, weights=self.durations, minlength=last_day - first_day + 1)
+        practiced = daily > 0
+
+        run_starts, run_lengths = runs(practiced)
+        longest = int(run_lengths.max()) if len(run_lengths) else 0
+        # A streak is still alive until a whole day is missed
+        current = 0
+        if len(run_starts):
+            run_end = first_day + int(run_starts[-1] + run_lengths[-1]) - 1
+            if run_end >= today - 1:
+                current = int(run_lengths[-1])
+
+        weeks = (days + WEEK_SHIFT) // 7
+        first_week = int(weeks.min())
+        weekly = np.bincount(weeks - first_week, weights=self.durations,
+                             minlength=(last_day + WEEK_SHIFT) // 7 - first_week + 1)
+
+        hours = (self.starts % DAY) // 3600
+        today_index = today - first_day
+        rolling = {window: rolling_mean(daily, window) for window in ROLLING_WINDOWS}
+
+        return {
+            "sessions": len(self.starts),
+            "total": int(self.durations.sum()),
+            "first_day": day_to_date(first_day),
+            "days_practiced": int(practiced.sum()),
+            "current_streak": current,
+            "longest_streak": longest,
+            "daily": daily,
+            "weekly": weekly,
+            "first_week": day_to_date(first_week * 7 - WEEK_SHIFT),
+            "rolling": rolling,
+            "rolling_today": {window: float(series[today_index]) for window, series in rolling.items()},
+            "hour_totals": np.bincount(hours, weights=self.durations, minlength=24),
+            "hour_counts": np.bincount(hours, minlength=24),
+        }
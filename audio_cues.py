@@ -0,0 +1,298 @@
+"""Optional audio cues: a click per countdown tick and a tone per new chord.
+
+Every cue is synthesized with NumPy once, ahead of time (when a practice
+file is loaded or a session starts), and kept as int16 samples in an LRU
+cache with a memory cap. Playing a cue on the timer's hot path is then a
+dict lookup and a hand-off to the sink; nothing is synthesized there
+unless the cue did not fit in the cache.
+
+Sinks only need play(samples) and close():
+  NullSink         - counts cues, for tests and benchmarks
+  WavSink          - writes cues to a WAV file, optionally on a timeline
+  SoundDeviceSink  - plays through the speakers (needs `sounddevice`)
+
+numpy is optional, as for analytics: available() tells callers whether
+cues can be used at all.
+"""
+import re
+import wave
+import zlib
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLE_RATE = 22050
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+AUDIO_MODES = ('off', 'clicks', 'chords', 'both')
+CHORD_SECONDS = 0.8
+# Countdown ticks at or below this many seconds get the accented click
+ACCENT_SECONDS = 3
+
+NOTE_OFFSETS = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+# Semitones above the root for each chord suffix
+QUALITIES = {
+    '': (0, 4, 7), 'maj': (0, 4, 7), 'm': (0, 3, 7), 'min': (0, 3, 7),
+    '5': (0, 7), '6': (0, 4, 7, 9), 'm6': (0, 3, 7, 9),
+    '7': (0, 4, 7, 10), 'maj7': (0, 4, 7, 11), 'm7': (0, 3, 7, 10), 'mmaj7': (0, 3, 7, 11),
+    '9': (0, 4, 7, 10, 14), 'add9': (0, 4, 7, 14), 'm9': (0, 3, 7, 10, 14),
+    'dim': (0, 3, 6), 'dim7': (0, 3, 6, 9), 'm7b5': (0, 3, 6, 10),
+    'aug': (0, 4, 8), '+': (0, 4, 8), 'sus2': (0, 2, 7), 'sus4': (0, 5, 7), 'sus': (0, 5, 7),
+    '7sus4': (0, 5, 7, 10),
+}
+CHORD_PATTERN = re.compile(r'^([A-G])([#b]?)([^/]*?)(?:/([A-G])([#b]?))?$')
+# Lowest root pitch (MIDI E2, the low guitar string)
+LOW_E = 40
+
+
+def available():
+    return np is not None
+
+
+def pitch_class(letter, accidental):
+    return (NOTE_OFFSETS[letter] + {'#': 1, 'b': -1}.get(accidental, 0)) % 12
+
+
+def chord_pitches(name):
+    """MIDI pitches for a chord name like 'Am', 'F#7' or 'C/G'; None when
+    the name is not a chord this knows"""
+    match = CHORD_PATTERN.match(name.strip())
+    if not match or match.group(3) not in QUALITIES:
+        return None
+    root = LOW_E + (pitch_class(match.group(1), match.group(2)) - 4) % 12
+    pitches = [root + interval for interval in QUALITIES[match.group(3)]] + [root + 12]
+    if match.group(4):
+        bass = root - (root - pitch_class(match.group(4), match.group(5))) % 12
+        if bass != root:
+            pitches.insert(0, bass)
+    return pitches
+
+
+def frequency(pitch):
+    return 440.0 * 2 ** ((pitch - 69) / 12)
+
+
+def to_int16(signal):
+    peak = np.abs(signal).max()
+    if peak > 0:
+        signal = signal * (0.8 / peak)
+    return (signal * 32767).astype(np.int16)
+
+
+def pluck(freq, length, sample_rate, decay=0.35):
+    """A plucked-string-like tone: a few harmonics under an exponential decay"""
+    t = np.arange(length) / sample_rate
+    tone = np.sin(2 * np.pi * freq * t) + 0.5 * np.sin(4 * np.pi * freq * t) + 0.25 * np.sin(6 * np.pi * freq * t)
+    envelope = np.exp(-t / decay)
+    attack = min(length, int(0.005 * sample_rate))
+    envelope[:attack] *= np.linspace(0, 1, attack)
+    return tone * envelope
+
+
+def render_click(sample_rate=SAMPLE_RATE, accent=False):
+    length = int(0.03 * sample_rate)
+    t = np.arange(length) / sample_rate
+    freq = 2000.0 if accent else 1000.0
+    return to_int16(np.sin(2 * np.pi * freq * t) * np.exp(-t / 0.006))
+
+
+def render_chord(name, sample_rate=SAMPLE_RATE, seconds=CHORD_SECONDS):
+    """A strummed chord tone for chord names; for anything else (e.g. 'Scales
+    warm-up') a two-note chime whose pitches depend on the name, so each
+    exercise still has a recognisable cue"""
+    length = int(seconds * sample_rate)
+    signal = np.zeros(length)
+    pitches = chord_pitches(name)
+    if pitches is None:
+        code = zlib.crc32(name.encode('utf-8'))
+        first, second = 72 + code % 12, 72 + (code >> 4) % 12 + 5
+        half = length // 2
+        signal[:half] += pluck(frequency(first), half, sample_rate, decay=0.15)
+        signal[half:] += pluck(frequency(second), length - half, sample_rate, decay=0.2)
+        return to_int16(signal)
+
+    strum = int(0.015 * sample_rate)  # Low strings sound first, like a downstroke
+    for position, pitch in enumerate(pitches):
+        offset = min(length, position * strum)
+        signal[offset:] += pluck(frequency(pitch), length - offset, sample_rate)
+    return to_int16(signal)
+
+
+class CueCache:
+    """LRU cache of rendered cues, capped at max_bytes of sample data"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render):
+        samples = self.entries.get(key)
+        if samples is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return samples
+        self.misses += 1
+        samples = render()
+        self.put(key, samples)
+        return samples
+
+    def put(self, key, samples):
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key).nbytes
+        if samples.nbytes > self.max_bytes:
+            return  # Never cache a cue that would evict everything else
+        self.entries[key] = samples
+        self.bytes += samples.nbytes
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class NullSink:
+    """Discards cues, counting them"""
+
+    def __init__(self):
+        self.played = 0
+        self.samples = 0
+
+    def play(self, samples):
+        self.played += 1
+        self.samples += len(samples)
+
+    def close(self):
+        pass
+
+
+class WavSink:
+    """Writes cues to a mono 16-bit WAV file.
+
+    With a clock (seconds, e.g. the session's), silence is inserted so each
+    cue starts at the time it was played and the file can be listened to
+    as the session sounded; without one, cues are written back to back.
+    """
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE, clock=None):
+        self.sample_rate = sample_rate
+        self.clock = clock
+        self.origin = clock() if clock else 0.0
+        self.position = 0
+        self.file = wave.open(path, 'wb')
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(sample_rate)
+
+    def play(self, samples):
+        if self.clock:
+            start = int((self.clock() - self.origin) * self.sample_rate)
+            if start > self.position:
+                self.file.writeframes(np.zeros(start - self.position, dtype='<i2').tobytes())
+                self.position = start
+        self.file.writeframes(samples.astype('<i2', copy=False).tobytes())
+        self.position += len(samples)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class SoundDeviceSink:
+    """Plays cues on the default output device without blocking"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        import sounddevice
+        self.sounddevice = sounddevice
+        self.sample_rate = sample_rate
+
+    def play(self, samples):
+        self.sounddevice.play(samples, self.sample_rate)
+
+    def close(self):
+        self.sounddevice.stop()
+
+
+class AudioCues:
+    """Plays cached cues for a PracticeSession's chord changes and ticks.
+
+    mode is one of AUDIO_MODES: clicks, chords or both. The countdown tick
+    that fires together with a chord change is not clicked, so the click
+    never cuts off the chord's tone.
+    """
+
+    def __init__(self, sink, mode='both', sample_rate=SAMPLE_RATE, max_bytes=DEFAULT_CACHE_BYTES):
+        if mode not in AUDIO_MODES:
+            raise ValueError(f"Unknown audio mode: {mode}")
+        self.sink = sink
+        self.clicks = mode in ('clicks', 'both')
+        self.chords = mode in ('chords', 'both')
+        self.sample_rate = sample_rate
+        self.cache = CueCache(max_bytes)
+        self.chord_sounding = False
+
+    def _click(self, accent):
+        return self.cache.get(('click', accent), lambda: render_click(self.sample_rate, accent))
+
+    def _chord(self, note):
+        return self.cache.get(('chord', note), lambda: render_chord(note, self.sample_rate))
+
+    def prepare(self, notes):
+        """Renders every cue a session with these chords can play.
+
+        When the chord cues would not all fit in the cache (e.g. a large
+        practice spec) none are rendered ahead; each renders on first use.
+        """
+        if self.clicks:
+            self._click(False)
+            self._click(True)
+        if self.chords and len(notes) * int(CHORD_SECONDS * self.sample_rate) * 2 <= self.cache.max_bytes:
+            for note in notes:
+                self._chord(note)
+
+    def chord(self, note):
+        if self.chords:
+            self.sink.play(self._chord(note))
+            self.chord_sounding = True
+
+    def tick(self, remaining):
+        if self.chord_sounding:
+            self.chord_sounding = False
+            return
+        if self.clicks:
+            self.sink.play(self._click(0 < remaining <= ACCENT_SECONDS))
+
+    def close(self):
+        self.sink.close()
+
+
+def open_audio(mode, wav_path=None, clock=None):
+    """AudioCues for mode, or None when mode is 'off'.
+
+    Cues go to a WAV file if wav_path is given, otherwise to the speakers.
+    Raises RuntimeError when numpy (or, for speakers, sounddevice) is
+    missing.
+    """
+    if mode == 'off':
+        return None
+    if not available():
+        raise RuntimeError("Audio cues need numpy (pip install numpy).")
+    if wav_path:
+        sink = WavSink(wav_path, clock=clock)
+    else:
+        try:
+            sink = SoundDeviceSink()
+        except (ImportError, OSError) as e:
+            raise RuntimeError(f"Audio output is unavailable ({e}); pip install sounddevice.") from e
+    return AudioCues(sink, mode)
@@ -0,0 +1,114 @@
+"""Cold-start benchmark: time from launch to the app's first drawn window.
+
+Launches the app from source and every PyInstaller build found under
+dist/<mode> (see exe_generator.py), each in an empty working directory, and
+reports the time until the first window is drawn. Needs a display. Run from
+the repository root:
+
+    python exe_generator.py --mode all --no-shortcut
+    python -m benchmarks.cold_start --runs 10
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from exe_generator import BUILD_MODES, executable_path
+
+from benchmarks.run_benchmarks import git_commit
+
+# Keep in sync with guitar_practice.STARTUP_PROBE_ENV_VAR (not imported so
+# that this process doesn't pay for tkinter)
+STARTUP_PROBE_ENV_VAR = 'GUITAR_PRACTICE_STARTUP_PROBE'
+LAUNCH_TIMEOUT = 60
+
+
+def variants():
+    """(name, command) for source and every build that exists"""
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'guitar_practice.py')
+    found = [("source", [sys.executable, script])]
+    for mode in BUILD_MODES:
+        path = executable_path(mode)
+        if os.path.exists(path):
+            found.append((mode, [path]))
+    return found
+
+
+def launch(command, workdir):
+    """Seconds from spawning `command` until its first window was drawn"""
+    probe = os.path.join(workdir, 'first_window.txt')
+    if os.path.exists(probe):
+        os.remove(probe)
+    env = dict(os.environ, **{STARTUP_PROBE_ENV_VAR: probe})
+    started = time.time()
+    subprocess.run(command, cwd=workdir, env=env, timeout=LAUNCH_TIMEOUT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with open(probe, 'r') as file:
+            return float(file.read()) - started
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help="launches per variant")
+    parser.add_argument('--output', help="also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        print("No display available; the app needs one to draw its window.")
+        return 1
+
+    results = []
+    for name, command in variants():
+        workdir = tempfile.mkdtemp(prefix='guitar_startup_')
+        try:
+            # The first launch creates practice_files/ and practice_logs/;
+            # don't count it so every variant is timed on the same footing
+            launch(command, workdir)
+            times = [launch(command, workdir) for _ in range(args.runs)]
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        times = [t for t in times if t is not None]
+        if not times:
+            print(f"{name:<9} failed to report a first window")
+            continue
+        result = {
+            "variant": name,
+            "runs": len(times),
+            "min_seconds": min(times),
+            "median_seconds": statistics.median(times),
+            "max_seconds": max(times),
+        }
+        results.append(result)
+        print(f"{name:<9} min {result['min_seconds'] * 1000:8.1f} ms   "
+              f"median {result['median_seconds'] * 1000:8.1f} ms   "
+              f"max {result['max_seconds'] * 1000:8.1f} ms", flush=True)
+
+    if args.output:
+        report = {
+            "meta": {
+                "date": datetime.now().isoformat(timespec='seconds'),
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
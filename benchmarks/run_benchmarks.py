@@ -0,0 +1,331 @@
+"""Headless benchmark suite for Guitar Practice.
+
+Generates synthetic session logs, practice files and practice libraries,
+times the operations behind the app's slow paths (log parsing, totals,
+sorting, practice file loading, chord sampling, practice spec expansion,
+the file picker index, audio cue rendering and playback)
+and records peak traced memory. Results are written as JSON so runs can
+be compared between versions. Run from the repository root:
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --log-rows 10000 1000000 --output new.json --compare old.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import audio_cues
+from chord_sampler import ChordSampler
+from practice_files import CACHE_SUFFIX, PracticeIndex, load_practice_file
+from session_model import SessionModel
+from session_store import CSVSessionStore, SQLiteSessionStore, migrate_csv_to_sqlite
+
+from benchmarks.synthetic import write_practice_file, write_practice_library, write_practice_spec, write_session_log
+
+SAMPLE_DRAWS = 100000
+CUE_PLAYS = 100000
+
+
+def measure(fn, setup=None, repeat=3, memory=True):
+    """Best wall time of `repeat` runs, plus peak traced memory of one more.
+
+    setup() runs untimed before every run and its result is passed to fn.
+    """
+    best = None
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        started = time.perf_counter()
+        fn(state)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        state = setup() if setup else None
+        gc.collect()
+        tracemalloc.start()
+        fn(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+class Suite:
+    def __init__(self, repeat, memory):
+        self.repeat = repeat
+        self.memory = memory
+        self.results = []
+
+    def run(self, group, name, size, fn, setup=None, per=None):
+        seconds, peak = measure(fn, setup, self.repeat, self.memory)
+        result = {"group": group, "name": name, "size": size, "seconds": seconds, "peak_bytes": peak}
+        if per:
+            result["ns_per_op"] = seconds / per * 1e9
+        self.results.append(result)
+        memory = f"{peak / 1e6:9.1f} MB" if peak is not None else ""
+        print(f"{group:<9} {name:<16} {size:>10}  {seconds * 1000:10.2f} ms {memory}", flush=True)
+
+
+def bench_log(suite, workdir, rows):
+    path = write_session_log(os.path.join(workdir, f"log_{rows}.csv"), rows)
+    size = rows
+
+    def fresh_store(_=None):
+        return CSVSessionStore(path)
+
+    def read_all(store):
+        return [row for rows, _, _ in store.changes_since(None) for row in rows]
+
+    suite.run("log", "parse", size, read_all, fresh_store)
+
+    def appended(_=None):
+        tail_path = path + '.tail'
+        shutil.copyfile(path, tail_path)
+        store = CSVSessionStore(tail_path)
+        store.reader.refresh()
+        for _ in store.reader.tail():
+            pass
+        with open(tail_path, 'a') as file:
+            for _ in range(100):
+                file.write("2099-01-01 00:00:00,2099-01-01 00:10:00,600\n")
+        return store
+
+    def read_tail(store):
+        store.reader.refresh()
+        return list(store.reader.tail())
+
+    suite.run("log", "tail_100", size, read_tail, appended)
+
+    def no_sidecar(_=None):
+        if os.path.exists(path + '.stats'):
+            os.remove(path + '.stats')
+        return CSVSessionStore(path)
+
+    suite.run("log", "totals_cold", size, lambda store: store.summary(), no_sidecar)
+    suite.run("log", "totals_warm", size, lambda store: store.summary(), fresh_store)
+
+    rows_list = read_all(CSVSessionStore(path))
+    suite.run("log", "model_build", size, lambda _: SessionModel(rows_list))
+
+    def model(_=None):
+        return SessionModel(rows_list)
+
+    def sort_all(m):
+        for col in SessionModel.COLUMNS:
+            m.order(col)
+
+    suite.run("log", "sort_columns", size, sort_all, model)
+
+    def sorted_model(_=None):
+        m = model()
+        m.order("Duration")
+        return m
+
+    suite.run("log", "sort_toggle", size,
+              lambda m: (m.window(0, 40, "Duration", True), m.window(0, 40, "Duration", False)),
+              sorted_model)
+
+    def sqlite_store(_=None):
+        db_path = os.path.join(workdir, f"log_{rows}.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        return SQLiteSessionStore(db_path)
+
+    suite.run("log", "sqlite_migrate", size, lambda store: migrate_csv_to_sqlite(path, store),
+              sqlite_store)
+    def unrotated(_=None):
+        rotated_dir = os.path.join(workdir, f"rotated_{rows}")
+        shutil.rmtree(rotated_dir, ignore_errors=True)
+        os.makedirs(rotated_dir)
+        shutil.copyfile(path, os.path.join(rotated_dir, "session_log.csv"))
+        return CSVSessionStore(os.path.join(rotated_dir, "session_log.csv"))
+
+    suite.run("log", "rotate", size, lambda store: store.rotate(), unrotated)
+    rotated = unrotated()
+    rotated.rotate()
+    suite.run("log", "rotated_totals", size,
+              lambda _: CSVSessionStore(rotated.path).summary())
+    suite.run("log", "rotated_range", size,
+              lambda _: CSVSessionStore(rotated.path).count_in_range("2016-01-15 00:00:00", "2016-12-31 23:59:59"))
+
+    store = SQLiteSessionStore(os.path.join(workdir, f"log_{rows}.db"))
+    suite.run("log", "sqlite_newest_50", size, lambda _: store.newest(50))
+    suite.run("log", "sqlite_range", size,
+              lambda _: store.count_in_range("2016-01-01 00:00:00", "2016-12-31 23:59:59"))
+    store.close()
+
+
+def bench_practice(suite, workdir, rows):
+    path = write_practice_file(os.path.join(workdir, f"practice_{rows}.csv"), rows)
+
+    def no_cache(_=None):
+        if os.path.exists(path + CACHE_SUFFIX):
+            os.remove(path + CACHE_SUFFIX)
+
+    suite.run("practice", "load_cold", rows, lambda _: load_practice_file(path), no_cache)
+    load_practice_file(path)
+    suite.run("practice", "load_cached", rows, lambda _: load_practice_file(path))
+
+    practice = load_practice_file(path)
+    suite.run("practice", "sampler_build", rows,
+              lambda _: ChordSampler().set_notes(practice.notes, practice.weights))
+
+    for mode in ChordSampler.MODES:
+        def sampler(_=None, mode=mode):
+            s = ChordSampler(mode=mode)
+            s.set_notes(practice.notes, practice.weights)
+            for note in practice.notes[:20]:
+                s.record_skip(note)
+            return s
+
+        def draw(s):
+            for _ in range(SAMPLE_DRAWS):
+                s.draw()
+
+        suite.run("practice", f"draw_{mode.lower()}", rows, draw, sampler, per=SAMPLE_DRAWS)
+
+
+def bench_spec(suite, workdir, combinations):
+    path = write_practice_spec(os.path.join(workdir, f"spec_{combinations}.csv"), combinations)
+    suite.run("spec", "load", combinations, lambda _: load_practice_file(path))
+
+    practice = load_practice_file(path)
+    size = len(practice)
+    suite.run("spec", "sampler_build", size, lambda _: ChordSampler().set_notes(practice.notes, practice.weights))
+
+    for mode in ("Random", "Shuffle"):
+        def sampler(_=None, mode=mode):
+            s = ChordSampler(mode=mode)
+            s.set_notes(practice.notes, practice.weights)
+            return s
+
+        def draw(s):
+            for _ in range(SAMPLE_DRAWS):
+                s.draw()
+
+        suite.run("spec", f"draw_{mode.lower()}", size, draw, sampler, per=SAMPLE_DRAWS)
+
+
+def bench_library(suite, workdir, files):
+    directory = write_practice_library(os.path.join(workdir, f"library_{files}"), files)
+
+    def no_index(_=None):
+        index_path = os.path.join(directory, '.practice_index.json')
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        return PracticeIndex(directory)
+
+    suite.run("library", "index_cold", files, lambda index: index.refresh(), no_index)
+    suite.run("library", "index_warm", files, lambda index: index.refresh(), lambda _=None: PracticeIndex(directory))
+
+    index = PracticeIndex(directory)
+    index.refresh()
+    suite.run("library", "search", files, lambda _: (index.search("exercise_0001"), index.search("99")))
+
+
+def bench_audio(suite, chords):
+    notes = [f"Chord {i}" for i in range(chords)]
+    suite.run("audio", "prepare", chords,
+              lambda cues: cues.prepare(notes), lambda _=None: audio_cues.AudioCues(audio_cues.NullSink()))
+
+    cues = audio_cues.AudioCues(audio_cues.NullSink())
+    cues.prepare(notes)
+
+    def play(_):
+        for i in range(CUE_PLAYS):
+            cues.chord(notes[i % chords])
+            cues.tick(i % 15)
+
+    suite.run("audio", "play_cached", chords, play, per=CUE_PLAYS)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r') as file:
+        baseline = {
+            (r["group"], r["name"], r["size"]): r for r in json.load(file)["results"]
+        }
+    print(f"\nCompared with {baseline_path} (ratio > 1 is slower):")
+    for result in results:
+        old = baseline.get((result["group"], result["name"], result["size"]))
+        if old and old["seconds"]:
+            ratio = result["seconds"] / old["seconds"]
+            flag = "  <-- regression" if ratio > 1.2 else ""
+            print(f"{result['group']:<9} {result['name']:<16} {result['size']:>10}  {ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--log-rows', type=int, nargs='*', default=[10000, 100000],
+                        help="session log sizes (e.g. 10000 1000000 10000000)")
+    parser.add_argument('--practice-rows', type=int, nargs='*', default=[10, 1000, 100000],
+                        help="practice file sizes")
+    parser.add_argument('--spec-combinations', type=int, nargs='*', default=[1000000],
+                        help="practice spec sizes, in chord combinations")
+    parser.add_argument('--library-files', type=int, nargs='*', default=[1000],
+                        help="practice library sizes for the file picker index")
+    parser.add_argument('--audio-chords', type=int, nargs='*', default=[10, 100],
+                        help="chords to render audio cues for (needs numpy)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--data-dir', help="keep generated data here instead of a temp dir")
+    parser.add_argument('--output', default='bench_results.json', help="JSON results file")
+    parser.add_argument('--compare', help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    workdir = args.data_dir or tempfile.mkdtemp(prefix='guitar_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    suite = Suite(args.repeat, not args.no_memory)
+    try:
+        for rows in args.log_rows:
+            bench_log(suite, workdir, rows)
+        for rows in args.practice_rows:
+            bench_practice(suite, workdir, rows)
+        for combinations in args.spec_combinations:
+            bench_spec(suite, workdir, combinations)
+        for files in args.library_files:
+            bench_library(suite, workdir, files)
+        if audio_cues.available():
+            for chords in args.audio_chords:
+                bench_audio(suite, chords)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec='seconds'),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": suite.results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(suite.results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
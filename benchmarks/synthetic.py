@@ -0,0 +1,86 @@
+"""Generators for synthetic session logs, practice files and libraries"""
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from session_store import CSV_HEADER, TIME_FORMAT
+
+ROOTS = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+QUALITIES = ["", "m", "7", "m7", "maj7", "sus2", "sus4", "dim", "aug", "9", "add9", "6"]
+
+
+def write_session_log(path, rows, seed=0, start=datetime(2015, 1, 1)):
+    """Writes `rows` chronologically ordered sessions in the app's CSV format.
+
+    Sessions are 1-90 minutes long with gaps of up to two days, and are
+    streamed to disk so even 10M-row logs need no more than a buffer of RAM.
+    """
+    rng = random.Random(seed)
+    current = start
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        batch = []
+        for _ in range(rows):
+            current += timedelta(seconds=rng.randint(600, 172800))
+            duration = rng.randint(60, 5400)
+            end = current + timedelta(seconds=duration)
+            batch.append((current.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT), duration))
+            current = end
+            if len(batch) >= 10000:
+                writer.writerows(batch)
+                batch = []
+        writer.writerows(batch)
+    return path
+
+
+def chord_names(count):
+    """Distinct chord names: roots x qualities, then numbered voicings"""
+    names = []
+    position = 0
+    while len(names) < count:
+        for root in ROOTS:
+            for quality in QUALITIES:
+                name = f"{root}{quality}" if position == 0 else f"{root}{quality}/{position}"
+                names.append(name)
+                if len(names) == count:
+                    return names
+        position += 1
+    return names
+
+
+def write_practice_file(path, rows, seed=0, weights=True):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Type", "Duration", "Weight"] if weights else ["Type", "Duration"])
+        for name in chord_names(rows):
+            row = [name, rng.choice([5, 10, 15, 20, 30])]
+            if weights:
+                row.append(rng.choice([1, 1, 1, 2, 3]))
+            writer.writerow(row)
+    return path
+
+
+def write_practice_spec(path, combinations):
+    """Writes a practice spec of about `combinations` chords: roots x
+    qualities x numbered positions, plus a small weighted group"""
+    positions = max(1, -(-combinations // (len(ROOTS) * len(QUALITIES))))
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Root", "Quality", "Position", "Duration", "Weight", "Format"])
+        writer.writerow([
+            "|".join(ROOTS), "|".join(QUALITIES), "|".join(str(i) for i in range(positions)),
+            10, 1, "{Root}{Quality}/{Position}"
+        ])
+        writer.writerow(["E|A|D", "|m", "", 20, 100, "{Root}{Quality}"])
+    return path
+
+
+def write_practice_library(directory, files, rows=20, seed=0):
+    """Fills a directory with `files` small practice files"""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(files):
+        write_practice_file(os.path.join(directory, f"exercise_{i:06d}.csv"), rows, seed + i)
+    return directory
@@ -0,0 +1,242 @@
+import random
+from collections import deque
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw"""
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if total <= 0:
+            weights, total = [1.0] * n, float(n)
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class RunTable:
+    """Weighted draws over runs of equally weighted indexes, such as the
+    groups of a practice spec: the alias table picks a run (by count x
+    weight), then an index inside it is picked uniformly. O(runs) to build
+    and O(1) per draw, however many indexes the runs cover."""
+
+    def __init__(self, runs):
+        self.starts = []
+        self.counts = []
+        start = 0
+        for count, _ in runs:
+            self.starts.append(start)
+            self.counts.append(count)
+            start += count
+        self.size = start
+        weights = [count * weight for count, weight in runs]
+        self.runs = AliasTable(weights if sum(weights) > 0 else self.counts)
+
+    def __len__(self):
+        return self.size
+
+    def draw(self, rng=random):
+        run = self.runs.draw(rng)
+        return self.starts[run] + int(rng.random() * self.counts[run])
+
+
+class PermutationBag:
+    """Shuffle bag over range(n) in constant memory.
+
+    Each bag draws random keys for a bijection on [0, 2**bits) made of
+    invertible steps (odd multiply plus offset, then xor-shift, mod
+    2**bits). Values past n are fed through the bijection again until they
+    land in range(n) (cycle walking), which keeps it a permutation of
+    range(n): every index comes out exactly once per bag.
+    """
+
+    ROUNDS = 3
+
+    def __init__(self, n, rng=random):
+        self.n = n
+        self.bits = max(1, (n - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.shift = self.bits // 2 + 1
+        self.keys = [
+            (int(rng.random() * (1 << self.bits)) | 1, int(rng.random() * (1 << self.bits)))
+            for _ in range(self.ROUNDS)
+        ]
+        self.position = 0
+
+    def __len__(self):
+        return self.n - self.position
+
+    def _permute(self, x):
+        for multiplier, offset in self.keys:
+            x = (x * multiplier + offset) & self.mask
+            x ^= x >> self.shift
+        return x
+
+    def peek(self):
+        x = self._permute(self.position)
+        while x >= self.n:
+            x = self._permute(x)
+        return x
+
+    def pop(self):
+        x = self.peek()
+        self.position += 1
+        return x
+
+
+def is_lazy(notes):
+    """True for on-demand sequences such as a practice spec's ExerciseSpace,
+    which expose their weights as runs instead of one weight per chord"""
+    return hasattr(notes, 'runs')
+
+
+class ChordSampler:
+    """Picks the next chord to practice.
+
+    Modes:
+      Random   - weighted by the practice file's Weight column (uniform
+                 when the column is absent), via an alias table
+      Shuffle  - every chord once per cycle in random order, no repeat
+                 across cycle boundaries
+      Adaptive - like Random, but chords recently skipped with Next come
+                 up more often
+
+    Tables are rebuilt only when the notes change, so every draw is O(1)
+    regardless of the size of the practice file. Lazy note sequences (see
+    is_lazy) are never copied or expanded: draws pick an index directly
+    through a RunTable, and Shuffle walks a PermutationBag.
+    """
+
+    MODES = ("Random", "Shuffle", "Adaptive")
+    # Number of recent skips remembered by Adaptive mode; older skips decay out
+    SKIP_MEMORY = 50
+    # Share of Adaptive draws taken from the skip history once it is full
+    SKIP_BIAS = 0.5
+
+    def __init__(self, mode="Random", rng=None):
+        self.mode = mode
+        self.rng = rng or random.Random()
+        self.notes = []
+        self.table = None
+        self.bag = []
+        # Indexes into notes, so a redraw goes through notes[index] like any
+        # other draw (lazy sequences only name an index when it is drawn)
+        self.skipped = deque(maxlen=self.SKIP_MEMORY)
+        self.last = None
+        self.last_index = None
+
+    def set_notes(self, notes, weights=None):
+        if is_lazy(notes):
+            self.notes = notes
+            self.table = RunTable(notes.runs)
+        else:
+            self.notes = list(notes)
+            self.table = AliasTable(weights if weights is not None else [1.0] * len(self.notes))
+        self.bag = []
+        self.skipped.clear()
+        self.last = None
+        self.last_index = None
+
+    def update_notes(self, notes, weights=None):
+        """Swaps in an edited chord list without restarting the current cycle.
+
+        Chords still present keep their place in the shuffle bag and skip
+        history; new chords join the remainder of the current cycle. Lazy
+        sequences start over, as their positions can't be matched up.
+        """
+        if is_lazy(notes) or is_lazy(self.notes):
+            mode = self.mode
+            self.set_notes(notes, weights)
+            self.mode = mode
+            return
+        notes = list(notes)
+        if notes == self.notes:
+            self.table = AliasTable(weights if weights is not None else [1.0] * len(notes))
+            return
+
+        positions = {note: i for i, note in enumerate(notes)}
+        old_notes = set(self.notes)
+        bag = [positions[self.notes[i]] for i in self.bag if self.notes[i] in positions]
+        if self.bag:
+            for i, note in enumerate(notes):
+                if note not in old_notes:
+                    bag.insert(int(self.rng.random() * (len(bag) + 1)), i)
+
+        skipped = [positions[self.notes[i]] for i in self.skipped if self.notes[i] in positions]
+
+        self.notes = notes
+        self.table = AliasTable(weights if weights is not None else [1.0] * len(notes))
+        self.bag = bag
+        self.skipped.clear()
+        self.skipped.extend(skipped)
+        if self.last_index is not None:
+            self.last_index = positions.get(self.last)
+
+    def set_mode(self, mode):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown sampling mode: {mode}")
+        self.mode = mode
+        self.bag = []
+
+    def record_skip(self, note):
+        if note == self.last and self.last_index is not None:
+            self.skipped.append(self.last_index)
+        elif not is_lazy(self.notes) and note in self.notes:
+            self.skipped.append(self.notes.index(note))
+
+    def draw(self):
+        if not self.notes:
+            raise IndexError("No chords to draw from")
+        if self.mode == "Shuffle":
+            index = self._draw_from_bag()
+        elif self.mode == "Adaptive" and self.skipped and \
+                self.rng.random() < self.SKIP_BIAS * len(self.skipped) / self.SKIP_MEMORY:
+            index = self.skipped[int(self.rng.random() * len(self.skipped))]
+        else:
+            index = self.table.draw(self.rng)
+        note = self.notes[index]
+        self.last = note
+        self.last_index = index
+        return note
+
+    def _draw_from_bag(self):
+        if not self.bag:
+            if is_lazy(self.notes):
+                self._refill_permutation()
+                return self.bag.pop()
+            # Refill once per cycle: O(n) every n draws
+            self.bag = list(range(len(self.notes)))
+            self.rng.shuffle(self.bag)
+            # The bag is popped from the end; keep the first pick of the new
+            # cycle from repeating the last pick of the previous one
+            if len(self.bag) > 1 and self.notes[self.bag[-1]] == self.last:
+                self.bag[-1], self.bag[0] = self.bag[0], self.bag[-1]
+        return self.bag.pop()
+
+    def _refill_permutation(self):
+        # A new bag is cheap, so a first pick repeating the last one of the
+        # previous cycle is avoided by drawing new keys
+        for _ in range(8):
+            self.bag = PermutationBag(len(self.notes), self.rng)
+            if len(self.notes) < 2 or self.notes[self.bag.peek()] != self.last:
+                break
@@ -0,0 +1,139 @@
+import csv
+import io
+import os
+import queue
+import threading
+import time
+
+from session_store import TIME_FORMAT
+
+EVENT_HEADER = ["Session Start", "Chord", "Shown At", "Dwell (seconds)", "Skipped"]
+EVENT_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+FSYNC_POLICIES = ('never', 'batch', 'interval')
+
+
+class ChordEventWriter:
+    """Appends one row per chord shown to a CSV, from a background thread.
+
+    record() only puts a tuple on a bounded queue and never blocks: if the
+    writer falls behind and the queue is full the event is dropped and
+    counted in `dropped`. The writer thread formats queued events and
+    writes them in batches (group commit) with a single write and flush.
+    If writing fails (e.g. the directory is gone or the disk is full), the
+    exception is kept in `error` and every later event is dropped.
+
+    fsync policy:
+      never    - leave durability to the OS
+      batch    - fsync after every batch
+      interval - fsync at most every `fsync_interval` seconds
+    """
+
+    def __init__(self, path, queue_size=10000, batch_size=256, flush_interval=0.5,
+                 fsync='interval', fsync_interval=5.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self.thread = None
+        self._stop = object()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="chord-event-writer", daemon=True)
+            self.thread.start()
+        return self
+
+    def record(self, session_start, chord, shown_at, dwell, skipped):
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait((session_start, chord, shown_at, dwell, skipped))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Writes everything still queued and stops the writer thread"""
+        if self.thread is not None:
+            if self.thread.is_alive():
+                try:
+                    self.queue.put(self._stop, timeout=timeout)
+                except queue.Full:
+                    pass  # Stuck writer; give up on what is still queued
+                else:
+                    self.thread.join(timeout)
+            self.thread = None
+
+    def _run(self):
+        try:
+            self._write_events()
+        except Exception as e:
+            self.error = e
+            # Nothing more can be written; count what was still queued
+            while True:
+                try:
+                    if self.queue.get_nowait() is not self._stop:
+                        self.dropped += 1
+                except queue.Empty:
+                    break
+
+    def _write_events(self):
+        file_exists = os.path.exists(self.path)
+        with open(self.path, 'a', newline='') as file:
+            if not file_exists:
+                csv.writer(file).writerow(EVENT_HEADER)
+                file.flush()
+            last_sync = time.monotonic()
+            stopping = False
+            while not stopping:
+                try:
+                    first = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = [first]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self._stop in batch:
+                    stopping = True
+                    batch = [event for event in batch if event is not self._stop]
+                    # Drain whatever raced in behind the stop marker
+                    while True:
+                        try:
+                            batch.append(self.queue.get_nowait())
+                        except queue.Empty:
+                            break
+
+                if batch:
+                    file.write(self._format(batch))
+                    file.flush()
+                    self.written += len(batch)
+
+                now = time.monotonic()
+                if (self.fsync == 'batch'
+                        or (stopping and self.fsync != 'never')
+                        or (self.fsync == 'interval' and now - last_sync >= self.fsync_interval)):
+                    os.fsync(file.fileno())
+                    last_sync = now
+
+    def _format(self, batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for session_start, chord, shown_at, dwell, skipped in batch:
+            writer.writerow([
+                session_start.strftime(TIME_FORMAT),
+                chord,
+                shown_at.strftime(EVENT_TIME_FORMAT)[:-3],
+                f"{dwell:.3f}",
+                1 if skipped else 0
+            ])
+        return buffer.getvalue()
@@ -1,8 +1,24 @@
+import argparse
 import os
 import sys
 import subprocess
-import winshell
-from win32com.client import Dispatch
+
+APP_NAME = 'GuitarPractice'
+
+# onedir   - folder bundle; starts fastest, nothing is unpacked at launch
+# onefile  - single EXE; unpacks the whole bundle to a temp dir every launch
+# stripped - onedir without modules the app never uses, symbols stripped
+BUILD_MODES = ('onedir', 'onefile', 'stripped')
+
+# Standard library packages PyInstaller pulls in through its hooks but the
+# app never imports. multiprocessing, sqlite3 and json are used and stay in.
+EXCLUDED_MODULES = [
+    'unittest', 'doctest', 'pydoc', 'pdb', 'test', 'lib2to3', 'distutils',
+    'setuptools', 'pip', 'email', 'http', 'xmlrpc', 'xml', 'html',
+    'tkinter.test', 'tkinter.tix', 'turtle', 'turtledemo', 'idlelib',
+    'curses', 'ssl',
+]
+
 
 def remove_obsolete_packages():
     """Remove obsolete packages incompatible with PyInstaller"""
@@ -14,7 +30,17 @@ def remove_obsolete_packages():
         except subprocess.CalledProcessError:
             print(f"Could not remove {package}. Please remove manually.")
 
-def create_exe():
+def dist_dir(mode):
+    return os.path.join(os.getcwd(), 'dist', mode)
+
+def executable_path(mode):
+    """Path of the built executable for a build mode"""
+    name = APP_NAME + ('.exe' if sys.platform == 'win32' else '')
+    if mode == 'onefile':
+        return os.path.join(dist_dir(mode), name)
+    return os.path.join(dist_dir(mode), APP_NAME, name)
+
+def create_exe(mode='onefile'):
     """Create executable for Guitar Practice"""
     script_path = 'guitar_practice.py'
     
@@ -23,30 +49,49 @@ def create_exe():
         print(f"Error: {script_path} not found!")
         return False
     
-    # Construct PyInstaller command
+    # Construct PyInstaller command; each mode builds into its own dist/<mode>
     cmd = [
-        'pyinstaller', 
-        '--onefile', 
-        '--windowed', 
-        '--name', 'GuitarPractice',
+        'pyinstaller',
+        '--onefile' if mode == 'onefile' else '--onedir',
+        '--windowed',
+        '--noconfirm',
+        '--name', APP_NAME,
+        '--distpath', dist_dir(mode),
+        '--workpath', os.path.join(os.getcwd(), 'build', mode),
         '--icon', os.path.join(os.getcwd(), 'music_guitar.ico'),
-        script_path  # Remove the duplicate at the end
     ]
+    if mode == 'stripped':
+        for module in EXCLUDED_MODULES:
+            cmd += ['--exclude-module', module]
+        if sys.platform != 'win32':
+            cmd.append('--strip')
+    cmd.append(script_path)
     
     # Run PyInstaller with detailed error handling
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print("EXE created successfully!")
+        print(f"EXE created successfully: {executable_path(mode)}")
         return True
+    except FileNotFoundError:
+        print("Error creating EXE: pyinstaller not found. Install it with: pip install pyinstaller")
+        return False
     except subprocess.CalledProcessError as e:
         print("Error creating EXE:")
         print("Standard Output:", e.stdout)
         print("Standard Error:", e.stderr)
         return False
 
-def create_shortcut():
-    """Create desktop shortcut for the executable"""
-    exe_path = os.path.join(os.getcwd(), 'dist', 'GuitarPractice.exe')
+def create_shortcut(mode='onefile'):
+    """Create desktop shortcut for the executable (Windows only)"""
+    if sys.platform != 'win32':
+        print("Desktop shortcuts are only created on Windows")
+        return False
+    
+    # Only needed here, and only available on Windows
+    import winshell
+    from win32com.client import Dispatch
+    
+    exe_path = executable_path(mode)
     
     if not os.path.exists(exe_path):
         print(f"Executable not found at {exe_path}")
@@ -69,12 +114,26 @@ def create_shortcut():
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the Guitar Practice executable with PyInstaller")
+    parser.add_argument(
+        '--mode',
+        choices=BUILD_MODES + ('all',),
+        default='onefile',
+        help="onedir starts fastest; onefile is a single EXE; stripped is onedir minus unused modules"
+    )
+    parser.add_argument('--no-shortcut', action='store_true', help="don't create a desktop shortcut")
+    args = parser.parse_args()
+    
     remove_obsolete_packages()
     
-    if create_exe():
-        create_shortcut()
-    else:
-        print("Failed to create executable. Check the error messages above.")
+    modes = BUILD_MODES if args.mode == 'all' else (args.mode,)
+    for mode in modes:
+        if not create_exe(mode):
+            print("Failed to create executable. Check the error messages above.")
+            return
+    
+    if not args.no_shortcut:
+        create_shortcut(modes[0])
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
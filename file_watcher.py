@@ -0,0 +1,114 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class InotifySource:
+    """Non-blocking inotify watch on a file's directory (Linux only).
+
+    The directory is watched rather than the file so that editors which
+    save by writing a new file and renaming it over the old one are seen.
+    """
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.name = os.fsencode(os.path.basename(path))
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path))
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def changed(self):
+        """Drains pending events; True if any of them touched the file"""
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(data):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(data, pos)
+                pos += INOTIFY_EVENT.size
+                name = data[pos:pos + length].rstrip(b'\0')
+                pos += length
+                if name == self.name:
+                    changed = True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class StatSource:
+    """Portable fallback: compares the file's stat signature on each check"""
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = self._signature()
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def changed(self):
+        signature = self._signature()
+        if signature != self.signature:
+            self.signature = signature
+            return True
+        return False
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """Reports writes to a single file, debounced.
+
+    check() never blocks and is meant to be called periodically from the
+    UI loop; it returns True once per burst of writes, after the file has
+    been quiet for `debounce` seconds.
+    """
+
+    def __init__(self, path, debounce=0.05):
+        self.path = path
+        self.debounce = debounce
+        self.pending_since = None
+        self.source = None
+        if sys.platform.startswith('linux'):
+            try:
+                self.source = InotifySource(path)
+            except (OSError, AttributeError):
+                self.source = None
+        if self.source is None:
+            self.source = StatSource(path)
+
+    def check(self):
+        now = time.monotonic()
+        if self.source.changed():
+            self.pending_since = now
+        if self.pending_since is not None and now - self.pending_since >= self.debounce:
+            self.pending_since = None
+            return True
+        return False
+
+    def close(self):
+        self.source.close()
@@ -1,18 +1,81 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
-import random
-import time
+import argparse
 import csv
+import tkinter as tk
+from tkinter import ttk, messagebox
 import os
+import queue
 import sys
+import threading
+import time
 import atexit
-from datetime import datetime
-from threading import Thread, Event
+import perf_metrics
+from chord_sampler import ChordSampler
+from event_log import FSYNC_POLICIES, ChordEventWriter
+from file_watcher import FileWatcher
+from practice_core import DEFAULT_LOG_DIR, EVENT_LOG_NAME, JOURNAL_NAME, PracticeSession
+from practice_files import CACHE_SUFFIX, PracticeIndex
+from profiles import (DEFAULT_PROFILE, create_profile, is_valid_name, list_profiles,
+                      merge_aggregates, profile_dir, submit_shards)
+from session_journal import SessionJournal
+from session_model import SessionModel
+from session_store import export_csv, open_session_store
+
+# Cold-start benchmarking: when set to a file path, the app writes the wall
+# clock time once its first window is drawn, then exits
+STARTUP_PROBE_ENV_VAR = 'GUITAR_PRACTICE_STARTUP_PROBE'
+
+def format_seconds(value):
+    """Whole seconds without a decimal point, fractions to one decimal place"""
+    return str(int(value)) if value == int(value) else f"{value:.1f}"
+
+class LoadedLog:
+    """What a ProgressViewer has read of the log: its own store (whose
+    reader remembers how far it got), the model and the store cursor.
+
+    The app keeps it between viewer opens, so a later open only reads the
+    sessions logged since.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self.model = SessionModel()
+        self.cursor = None
 
 class ProgressViewer(tk.Toplevel):
-    def __init__(self, parent, log_file):
+    # Only the rows in the viewport (plus a little overscan) exist as Treeview
+    # items; they are recycled as the view scrolls over self.model.
+    ROW_HEIGHT = 35
+    OVERSCAN = 5
+    # How often the open viewer picks up newly logged sessions
+    POLL_INTERVAL_MS = 2000
+    COLUMNS = ("Start", "End", "Duration")
+    # The log is loaded on a worker thread in chunks of LOAD_CHUNK sessions;
+    # the UI collects its progress every LOAD_POLL_MS
+    LOAD_CHUNK = 50000
+    LOAD_POLL_MS = 30
+    
+    def __init__(self, parent, session_store, loaded_log=None, on_closed=None):
         super().__init__(parent)
-        self.log_file = log_file
+        self.session_store = session_store
+        self.model = SessionModel()
+        self.view_offset = 0
+        self.row_items = []
+        self.selected_index = None
+        self.sort_state = ("Start", True)
+        self.log_cursor = None
+        self.poll_job = None
+        self.load_job = None
+        self.loading = False
+        self.load_span = None
+        # Own store for the loader thread, then for polling; the app keeps
+        # writing through session_store. A log read by an earlier viewer
+        # only has the new sessions folded in.
+        self.loaded_log = loaded_log or LoadedLog(session_store.reopen())
+        self.poll_store = self.loaded_log.store
+        # Called with the LoadedLog once the window closes after loading
+        self.on_closed = on_closed
+        # Built from the model rows the first time the Statistics tab is shown
+        self.analytics = None
         
         self.title("Practice Session Progress")
         self.geometry("900x600")
@@ -42,7 +105,7 @@ class ProgressViewer(tk.Toplevel):
             "Custom.Treeview", 
             background='#16213e', 
             foreground='white', 
-            rowheight=35, 
+            rowheight=self.ROW_HEIGHT, 
             fieldbackground='#16213e'
         )
         style.configure(
@@ -55,14 +118,49 @@ class ProgressViewer(tk.Toplevel):
             background=[('selected', '#e94560')],
             foreground=[('selected', 'white')]
         )
+        style.configure("Custom.TNotebook", background='#1a1a2e', borderwidth=0)
+        style.configure(
+            "Custom.TNotebook.Tab", 
+            background='#0f3460', 
+            foreground='white', 
+            font=('Roboto', 11, 'bold'), 
+            padding=(12, 4)
+        )
+        style.map('Custom.TNotebook.Tab', 
+            background=[('selected', '#e94560')]
+        )
+        
+        # Sessions and Statistics tabs
+        self.notebook = ttk.Notebook(main_frame, style="Custom.TNotebook")
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        sessions_tab = tk.Frame(self.notebook, bg='#1a1a2e')
+        self.stats_tab = tk.Frame(self.notebook, bg='#1a1a2e')
+        self.notebook.add(sessions_tab, text="Sessions")
+        self.notebook.add(self.stats_tab, text="Statistics")
+        self.build_statistics_tab()
+        self.notebook.bind('<<NotebookTabChanged>>', lambda event: self.update_statistics())
+        
+        # Shown while the log is loading
+        self.load_frame = tk.Frame(sessions_tab, bg='#1a1a2e')
+        self.load_frame.pack(fill=tk.X, pady=(10, 6))
+        self.load_label = tk.Label(
+            self.load_frame, 
+            text="Loading sessions...", 
+            bg='#1a1a2e', 
+            fg='white', 
+            font=('Roboto', 11)
+        )
+        self.load_label.pack(side=tk.LEFT)
+        self.load_bar = ttk.Progressbar(self.load_frame, mode='indeterminate', length=300)
+        self.load_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=(20, 0))
         
         # Treeview container
-        tree_frame = tk.Frame(main_frame, bg='#1a1a2e')
+        tree_frame = tk.Frame(sessions_tab, bg='#1a1a2e')
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
         self.tree = ttk.Treeview(
             tree_frame, 
-            columns=("Start", "End", "Duration"), 
+            columns=self.COLUMNS, 
             show="headings", 
             style="Custom.Treeview"
         )
@@ -76,20 +174,29 @@ class ProgressViewer(tk.Toplevel):
         self.tree.column("End", width=300, anchor='center')
         self.tree.column("Duration", width=150, anchor='center')
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(
+        # Scrollbar drives the model offset rather than the Treeview itself
+        self.scrollbar = ttk.Scrollbar(
             tree_frame, 
             orient=tk.VERTICAL, 
-            command=self.tree.yview
+            command=self.on_scroll
         )
-        self.tree.configure(yscroll=scrollbar.set)
         
         # Layout treeview and scrollbar
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree.bind('<Configure>', lambda event: self.render_window())
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', self.on_mousewheel)
+        self.tree.bind('<Button-5>', self.on_mousewheel)
+        self.tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_by(-self.visible_row_count()))
+        self.tree.bind('<Next>', lambda event: self.scroll_by(self.visible_row_count()))
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
         
         # Summary statistics frame with improved layout
-        summary_frame = tk.Frame(main_frame, bg='#16213e')
+        summary_frame = tk.Frame(sessions_tab, bg='#16213e')
         summary_frame.pack(fill=tk.X, pady=(20, 0), ipady=10)
         
         # Statistics labels with equal spacing
@@ -120,71 +227,617 @@ class ProgressViewer(tk.Toplevel):
         )
         self.avg_duration_label.pack(side=tk.LEFT, expand=True, padx=20)
         
+        tk.Button(
+            summary_frame,
+            text="Export CSV",
+            command=self.export_progress,
+            bg='#0f3460',
+            fg='#e94560',
+            font=('Roboto', 10, 'bold')
+        ).pack(side=tk.LEFT, padx=20)
+        
         # Load progress and calculate statistics
         self.load_progress()
+        self.bind('<Destroy>', self.on_destroy)
     
     def load_progress(self):
+        """Starts loading the log on a worker thread so the window shows at once"""
+        self.loading = True
+        self.load_span = perf_metrics.start('load_progress')
+        self.load_results = queue.Queue()
+        self.load_cancelled = threading.Event()
+        self.load_bar.start()
+        self.loader = threading.Thread(
+            target=load_sessions,
+            args=(self.poll_store, self.loaded_log.model, self.loaded_log.cursor, self.sort_state[0],
+                  self.LOAD_CHUNK, self.load_results, self.load_cancelled),
+            name="progress-loader",
+            daemon=True
+        )
+        self.loader.start()
+        self.load_job = self.after(self.LOAD_POLL_MS, self.receive_loaded)
+    
+    def receive_loaded(self):
+        """Applies whatever the loader thread has produced so far"""
+        self.load_job = None
+        while self.loading:
+            try:
+                message = self.load_results.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            
+            if kind == "summary":
+                self.show_summary(*message[1:])
+            elif kind == "preview":
+                # The first chunk of sessions, shown while the rest is parsed
+                self.model = message[1]
+                self.selected_index = None
+                self.view_offset = 0
+                self.render_window()
+            elif kind == "progress":
+                loaded, total = message[1:]
+                if self.load_bar.cget('mode') != 'determinate':
+                    self.load_bar.stop()
+                    self.load_bar.config(mode='determinate', maximum=total)
+                self.load_bar.config(value=loaded)
+                self.load_label.config(text=f"Loading sessions... {loaded:,} of {total:,}")
+            elif kind == "done":
+                self.model, self.log_cursor = message[1:]
+                self.selected_index = None
+                self.analytics = None
+                self.finish_loading()
+                self.render_window()
+                self.update_statistics()
+            elif kind == "missing":
+                self.finish_loading()
+                tk.messagebox.showinfo("No Data", "No session logs found.", parent=self)
+            elif kind == "error":
+                self.finish_loading()
+                tk.messagebox.showerror("Error", f"Could not read log file: {message[1]}", parent=self)
+        
+        if self.loading:
+            self.load_job = self.after(self.LOAD_POLL_MS, self.receive_loaded)
+    
+    def finish_loading(self):
+        self.loading = False
+        if self.load_span:
+            self.load_span.finish()
+            perf_metrics.count('sessions_loaded', len(self.model))
+        self.load_bar.stop()
+        self.load_frame.pack_forget()
+        self.poll_job = self.after(self.POLL_INTERVAL_MS, self.poll_log)
+    
+    def update_summary(self):
+        self.show_summary(*self.session_store.summary())
+    
+    def show_summary(self, session_count, total_duration):
+        avg_duration = total_duration // session_count if session_count > 0 else 0
+        
+        self.total_sessions_label.config(text=f"Total Sessions: {session_count}")
+        self.total_duration_label.config(text=f"Total Duration: {total_duration} sec")
+        self.avg_duration_label.config(text=f"Avg Session: {avg_duration} sec")
+    
+    def poll_log(self):
+        """Merges sessions appended to the log since the last read"""
         try:
-            with open(self.log_file, 'r') as file:
-                csv_reader = csv.reader(file)
-                next(csv_reader)  # Skip header
-                
-                total_duration = 0
-                session_count = 0
-                sessions = []
-                
-                for row in csv_reader:
-                    if len(row) == 3:
-                        try:
-                            duration = int(row[2])
-                            total_duration += duration
-                            session_count += 1
-                            sessions.append(row)
-                        except ValueError:
-                            pass
-                
-                # Sort sessions by start time (descending)
-                sessions.sort(key=lambda x: x[0], reverse=True)
-                
-                # Insert sorted sessions
-                for row in sessions:
-                    self.tree.insert("", tk.END, values=row, tags=('session',))
-                
-                # Update summary labels
-                avg_duration = total_duration // session_count if session_count > 0 else 0
-                
-                self.total_sessions_label.config(text=f"Total Sessions: {session_count}")
-                self.total_duration_label.config(text=f"Total Duration: {total_duration} sec")
-                self.avg_duration_label.config(text=f"Avg Session: {avg_duration} sec")
-                
-        except FileNotFoundError:
-            tk.messagebox.showinfo("No Data", "No session logs found.")
+            changed = False
+            for rows, cursor, reloaded in self.poll_store.changes_since(self.log_cursor):
+                base = len(self.model)
+                if reloaded:
+                    base = 0
+                    self.model.replace(rows)
+                    self.selected_index = None
+                    # Rebuilt from the model the next time it is shown
+                    self.analytics = None
+                else:
+                    self.model.extend(rows)
+                # From the model's parsed columns, so rows whose timestamps
+                # don't parse are skipped here just as in the model
+                if self.analytics is not None:
+                    self.analytics.extend_columns(self.model.starts[base:], self.model.durations[base:])
+                changed = changed or bool(rows) or reloaded
+            self.log_cursor = cursor
+            if changed:
+                self.render_window()
+                self.update_summary()
+                self.update_statistics()
         except Exception as e:
-            tk.messagebox.showerror("Error", f"Could not read log file: {e}")
+            # The model may hold part of what was read; start over next time
+            # rather than fold the same sessions in twice
+            self.log_cursor = None
+            print(f"Error reading new sessions: {e}")
+        self.poll_job = self.after(self.POLL_INTERVAL_MS, self.poll_log)
     
-    def sort_column(self, col, reverse):
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
+    def build_statistics_tab(self):
+        self.stats_message = tk.Label(
+            self.stats_tab, 
+            text="", 
+            bg='#1a1a2e', 
+            fg='white', 
+            font=('Roboto', 12)
+        )
+        self.stats_message.pack(pady=(10, 0))
         
-        try:
-            # If column is numeric (duration), sort numerically
-            l.sort(key=lambda t: int(t[0]), reverse=reverse)
-        except ValueError:
-            # If not numeric, sort as strings
-            l.sort(key=lambda t: t[0], reverse=reverse)
+        figures = tk.Frame(self.stats_tab, bg='#16213e')
+        figures.pack(fill=tk.X, pady=10, ipady=6)
+        self.stat_labels = {}
+        for column, (key, title) in enumerate((
+            ("days_practiced", "Days Practiced"),
+            ("current_streak", "Current Streak"),
+            ("longest_streak", "Longest Streak"),
+            ("rolling_7", "7-Day Avg"),
+            ("rolling_30", "30-Day Avg"),
+            ("this_week", "This Week"),
+        )):
+            tk.Label(figures, text=title, bg='#16213e', fg='white', font=('Roboto', 10)).grid(
+                row=0, column=column, padx=12
+            )
+            self.stat_labels[key] = tk.Label(
+                figures, text="-", bg='#16213e', fg='#e94560', font=('Roboto', 14, 'bold')
+            )
+            self.stat_labels[key].grid(row=1, column=column, padx=12)
+            figures.grid_columnconfigure(column, weight=1)
+        
+        charts = tk.Frame(self.stats_tab, bg='#1a1a2e')
+        charts.pack(fill=tk.BOTH, expand=True)
+        self.charts = {}
+        for key, title in (
+            ("daily", "Minutes per Day (last 30 days)"),
+            ("weekly", "Minutes per Week (last 12 weeks)"),
+            ("hours", "Minutes by Time of Day"),
+        ):
+            tk.Label(charts, text=title, bg='#1a1a2e', fg='#e94560', font=('Roboto', 11, 'bold')).pack(anchor='w')
+            canvas = tk.Canvas(charts, height=110, bg='#16213e', highlightthickness=0)
+            canvas.pack(fill=tk.X, pady=(2, 8))
+            canvas.bind('<Configure>', lambda event: self.update_statistics())
+            self.charts[key] = canvas
+    
+    def update_statistics(self):
+        """Refresh the Statistics tab, if it is the one showing"""
+        if self.notebook.select() != str(self.stats_tab):
+            return
+        if self.loading:
+            self.stats_message.config(text="Loading sessions...")
+            return
+        import analytics
+        if not analytics.available():
+            self.stats_message.config(text="Install numpy to see practice statistics.")
+            return
+        if self.analytics is None:
+            self.analytics = analytics.PracticeAnalytics.from_columns(self.model.starts, self.model.durations)
         
-        # Rearrange items in sorted positions
-        for index, (val, k) in enumerate(l):
-            self.tree.move(k, '', index)
+        stats = self.analytics.summary()
+        if stats is None:
+            self.stats_message.config(text="No sessions logged yet.")
+            return
+        
+        self.stats_message.config(text=f"{stats['sessions']} sessions since {stats['first_day']}")
+        self.stat_labels["days_practiced"].config(text=str(stats["days_practiced"]))
+        self.stat_labels["current_streak"].config(text=f"{stats['current_streak']} days")
+        self.stat_labels["longest_streak"].config(text=f"{stats['longest_streak']} days")
+        self.stat_labels["rolling_7"].config(text=f"{stats['rolling_today'][7] / 60:.0f} min/day")
+        self.stat_labels["rolling_30"].config(text=f"{stats['rolling_today'][30] / 60:.0f} min/day")
+        self.stat_labels["this_week"].config(text=f"{stats['weekly'][-1] / 60:.0f} min")
+        
+        daily = stats["daily"][-30:]
+        self.draw_bars(self.charts["daily"], daily / 60, [""] * len(daily))
+        weekly = stats["weekly"][-12:]
+        self.draw_bars(self.charts["weekly"], weekly / 60, [""] * len(weekly))
+        self.draw_bars(self.charts["hours"], stats["hour_totals"] / 60,
+                       [str(hour) if hour % 3 == 0 else "" for hour in range(24)])
+    
+    def draw_bars(self, canvas, values, labels):
+        canvas.delete('all')
+        width = canvas.winfo_width()
+        height = int(canvas.cget('height'))
+        if width <= 1 or not len(values):
+            return
+        top = max(values.max(), 1)
+        slot = width / len(values)
+        chart_height = height - 18
+        for i, (value, label) in enumerate(zip(values, labels)):
+            bar = int(value / top * (chart_height - 4))
+            x0 = i * slot + slot * 0.15
+            x1 = (i + 1) * slot - slot * 0.15
+            canvas.create_rectangle(x0, chart_height - bar, x1, chart_height, fill='#e94560', width=0)
+            if label:
+                canvas.create_text((x0 + x1) / 2, height - 8, text=label, fill='white', font=('Roboto', 8))
+    
+    def on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self.loading:
+            self.load_cancelled.set()
+            self.loading = False
+        for job in (self.poll_job, self.load_job):
+            if job:
+                self.after_cancel(job)
+        self.poll_job = self.load_job = None
+        if self.on_closed and not self.loader.is_alive() and self.log_cursor is not None:
+            self.loaded_log.model = self.model
+            self.loaded_log.cursor = self.log_cursor
+            self.on_closed(self.loaded_log)
+        else:
+            self.close_poll_store()
+    
+    def close_poll_store(self):
+        if self.loader.is_alive():
+            # Still in use by the (cancelled) loader; try again once it stops
+            self.master.after(self.LOAD_POLL_MS, self.close_poll_store)
+        else:
+            self.poll_store.close()
+    
+    def export_progress(self):
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export Sessions",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if filename:
+            try:
+                export_csv(self.session_store, filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not export sessions: {e}", parent=self)
+    
+    def visible_row_count(self):
+        """Number of rows that fit in the Treeview viewport"""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not mapped yet; fall back to the configured height
+            return int(self.tree.cget('height'))
+        # One row's worth of space is taken by the headings
+        return max(1, height // self.ROW_HEIGHT - 1)
+    
+    def max_offset(self):
+        return max(0, len(self.model) - self.visible_row_count())
+    
+    def render_window(self):
+        """Fill the recycled Treeview items with the rows at the current offset"""
+        self.view_offset = min(max(0, self.view_offset), self.max_offset())
+        visible = self.visible_row_count()
+        col, reverse = self.sort_state
+        rows = self.model.window(self.view_offset, visible + self.OVERSCAN, col, reverse)
+        
+        # Grow or shrink the item pool to match the window
+        while len(self.row_items) < len(rows):
+            self.row_items.append(self.tree.insert("", tk.END, tags=('session',)))
+        while len(self.row_items) > len(rows):
+            self.tree.delete(self.row_items.pop())
+        
+        for item, row in zip(self.row_items, rows):
+            self.tree.item(item, values=row)
+        
+        # Keep the selection attached to the model row, not the recycled item
+        window_index = None
+        if self.selected_index is not None:
+            window_index = self.selected_index - self.view_offset
+        if window_index is not None and 0 <= window_index < len(self.row_items):
+            self.tree.selection_set(self.row_items[window_index])
+            self.tree.focus(self.row_items[window_index])
+        elif self.tree.selection():
+            self.tree.selection_set(())
+        self.tree.yview_moveto(0)
+        
+        total = len(self.model)
+        if total:
+            self.scrollbar.set(self.view_offset / total, min(total, self.view_offset + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def scroll_to(self, offset):
+        offset = min(max(0, offset), self.max_offset())
+        if offset != self.view_offset:
+            self.view_offset = offset
+            self.render_window()
+    
+    def scroll_by(self, rows):
+        self.scroll_to(self.view_offset + rows)
+        return "break"
+    
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif action == 'scroll':
+            step = self.visible_row_count() if unit == 'pages' else 1
+            self.scroll_by(int(amount) * step)
+    
+    def on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            return self.scroll_by(-3)
+        return self.scroll_by(3)
+    
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.row_items:
+            self.selected_index = self.view_offset + self.row_items.index(selection[0])
+    
+    def move_selection(self, step):
+        if not self.model:
+            return "break"
+        if self.selected_index is None:
+            self.selected_index = self.view_offset
+        else:
+            self.selected_index = min(max(0, self.selected_index + step), len(self.model) - 1)
+        
+        # Scroll just enough to keep the selected row in view
+        visible = self.visible_row_count()
+        if self.selected_index < self.view_offset:
+            self.view_offset = self.selected_index
+        elif self.selected_index >= self.view_offset + visible:
+            self.view_offset = self.selected_index - visible + 1
+        self.render_window()
+        return "break"
+    
+    @perf_metrics.timed('sort_column')
+    def sort_column(self, col, reverse):
+        # The model caches one permutation per column, so this is an index
+        # flip plus a re-render of the visible window
+        self.sort_state = (col, reverse)
+        
+        # Show the top of the newly ordered rows
+        self.selected_index = None
+        self.view_offset = 0
+        self.render_window()
         
         # Update heading to show sort direction
         sort_symbol = "▲" if reverse else "▼"
         self.tree.heading(col, text=f"{col} {sort_symbol}", command=lambda: self.sort_column(col, not reverse))
 
+def load_sessions(store, model, cursor, sort_col, chunk_size, results, cancelled):
+    """ProgressViewer's loader thread: reads the log and builds the model.
+    
+    model and cursor are what an earlier viewer read (an empty model and
+    None the first time); only sessions logged since are read into it,
+    unless the store has to reload. Never touches Tk; everything goes to
+    the UI through the results queue as (kind, ...) messages, and the loop
+    stops early once cancelled is set.
+    """
+    try:
+        if not store.exists():
+            results.put(("missing",))
+            return
+        session_count, total_duration = store.summary()
+        results.put(("summary", session_count, total_duration))
+        
+        # Each chunk goes into the model as soon as it is parsed, so the log
+        # is never held as rows as well
+        for rows, cursor, reloaded in store.changes_since(cursor, chunk_size):
+            if cancelled.is_set():
+                return
+            if reloaded:
+                model = SessionModel()
+            if not len(model):
+                results.put(("preview", SessionModel(rows)))
+            model.extend(rows)
+            results.put(("progress", len(model), max(session_count, len(model))))
+        # Sort in the background too, so the swap in the UI is instant
+        model.order(sort_col)
+        results.put(("done", model, cursor))
+    except Exception as e:
+        results.put(("error", e))
+
+class DiagnosticsPanel(tk.Toplevel):
+    """Live timer jitter and event-loop stall percentiles"""
+    REFRESH_MS = 500
+    COLUMNS = ("count", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    
+    def __init__(self, parent, recorder):
+        super().__init__(parent)
+        self.recorder = recorder
+        self.title("Diagnostics")
+        self.configure(bg='#1a1a2e')
+        
+        table = tk.Frame(self, bg='#1a1a2e')
+        table.pack(padx=20, pady=20)
+        
+        for column, heading in enumerate(("Metric", "Samples", "p50 ms", "p95 ms", "p99 ms", "Max ms")):
+            tk.Label(
+                table,
+                text=heading,
+                bg='#1a1a2e',
+                fg='#e94560',
+                font=('Roboto', 11, 'bold')
+            ).grid(row=0, column=column, padx=8, pady=(0, 6))
+        
+        self.cells = {}
+        for row, metric in enumerate(recorder.METRICS, start=1):
+            tk.Label(table, text=metric, bg='#1a1a2e', fg='white', font=('Roboto', 11)).grid(
+                row=row, column=0, sticky='w', padx=8
+            )
+            for column, key in enumerate(self.COLUMNS, start=1):
+                cell = tk.Label(table, text="-", bg='#1a1a2e', fg='white', font=('Roboto', 11))
+                cell.grid(row=row, column=column, sticky='e', padx=8)
+                self.cells[metric, key] = cell
+        
+        self.refresh()
+    
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        for metric, values in self.recorder.summary().items():
+            for key in self.COLUMNS:
+                value = values[key]
+                self.cells[metric, key].config(text=str(value) if key == "count" else f"{value:.2f}")
+        self.after(self.REFRESH_MS, self.refresh)
+
+class ProfileDashboard(tk.Toplevel):
+    """Totals for every profile and combined.
+    
+    Each profile's log is reduced to its totals in a worker process and
+    only those partial aggregates come back to be merged, so the window
+    fills in as shards finish without blocking the UI.
+    """
+    POLL_MS = 50
+    COLUMNS = ("Sessions", "Hours", "Avg (sec)", "Longest (sec)")
+    
+    def __init__(self, parent, log_dir):
+        super().__init__(parent)
+        self.title("All Profiles")
+        self.configure(bg='#1a1a2e')
+        
+        self.table = tk.Frame(self, bg='#1a1a2e')
+        self.table.pack(padx=20, pady=20)
+        for column, heading in enumerate(("Profile",) + self.COLUMNS):
+            tk.Label(
+                self.table,
+                text=heading,
+                bg='#1a1a2e',
+                fg='#e94560',
+                font=('Roboto', 11, 'bold')
+            ).grid(row=0, column=column, padx=8, pady=(0, 6))
+        
+        profiles = list_profiles(log_dir)
+        self.cells = {}
+        for row, profile in enumerate(profiles + ["All profiles"], start=1):
+            font = ('Roboto', 11, 'bold') if row > len(profiles) else ('Roboto', 11)
+            tk.Label(self.table, text=profile, bg='#1a1a2e', fg='white', font=font).grid(
+                row=row, column=0, sticky='w', padx=8
+            )
+            for column, key in enumerate(self.COLUMNS, start=1):
+                cell = tk.Label(self.table, text="...", bg='#1a1a2e', fg='white', font=font)
+                cell.grid(row=row, column=column, sticky='e', padx=8)
+                self.cells[profile, key] = cell
+        
+        from concurrent.futures import ProcessPoolExecutor
+        self.executor = ProcessPoolExecutor(max_workers=min(len(profiles), os.cpu_count() or 1))
+        self.pending = submit_shards(self.executor, log_dir, profiles)
+        self.aggregates = {}
+        self.bind('<Destroy>', self.on_destroy)
+        self.poll_job = self.after(self.POLL_MS, self.poll)
+    
+    def show(self, profile, aggregate):
+        count = aggregate.count
+        values = (
+            str(count),
+            f"{aggregate.total / 3600:.1f}",
+            f"{aggregate.total / count:.0f}" if count else "-",
+            str(aggregate.max) if count else "-",
+        )
+        for key, value in zip(self.COLUMNS, values):
+            self.cells[profile, key].config(text=value)
+    
+    def poll(self):
+        self.poll_job = None
+        for future in [future for future in self.pending if future.done()]:
+            profile = self.pending.pop(future)
+            try:
+                self.aggregates[profile] = future.result()
+            except Exception as e:
+                print(f"Error reading profile {profile}: {e}")
+                for key in self.COLUMNS:
+                    self.cells[profile, key].config(text="error")
+                continue
+            self.show(profile, self.aggregates[profile])
+        
+        if self.pending:
+            self.poll_job = self.after(self.POLL_MS, self.poll)
+        else:
+            self.show("All profiles", merge_aggregates(self.aggregates.values()))
+            self.executor.shutdown(wait=False)
+    
+    def on_destroy(self, event):
+        if event.widget is self:
+            if self.poll_job:
+                self.after_cancel(self.poll_job)
+                self.poll_job = None
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+class ProfileSelector(tk.Toplevel):
+    """Startup dialog for picking whose practice log to use"""
+    
+    def __init__(self, parent, log_dir, selected=DEFAULT_PROFILE):
+        super().__init__(parent)
+        self.log_dir = log_dir
+        self.choice = None
+        self.title("Choose Profile")
+        self.configure(bg='#1a1a2e')
+        self.resizable(False, False)
+        
+        tk.Label(
+            self, 
+            text="Who is practicing?", 
+            bg='#1a1a2e', 
+            fg='#e94560', 
+            font=("Montserrat", 16, "bold")
+        ).pack(padx=20, pady=(20, 10))
+        
+        self.listbox = tk.Listbox(
+            self, 
+            bg='#16213e', 
+            fg='white', 
+            selectbackground='#e94560', 
+            font=('Roboto', 12), 
+            height=8, 
+            exportselection=False
+        )
+        self.listbox.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.listbox.bind('<Double-Button-1>', lambda event: self.open_profile())
+        self.listbox.bind('<Return>', lambda event: self.open_profile())
+        
+        buttons = tk.Frame(self, bg='#1a1a2e')
+        buttons.pack(pady=20)
+        for text, command in (("New Profile", self.new_profile), ("Open", self.open_profile)):
+            tk.Button(
+                buttons, 
+                text=text, 
+                command=command, 
+                bg='#0f3460', 
+                fg='#e94560', 
+                font=('Roboto', 11, 'bold')
+            ).pack(side=tk.LEFT, padx=8)
+        
+        self.fill(selected)
+        self.listbox.focus_set()
+    
+    def fill(self, selected):
+        self.profiles = list_profiles(self.log_dir)
+        self.listbox.delete(0, tk.END)
+        for profile in self.profiles:
+            self.listbox.insert(tk.END, profile)
+        index = self.profiles.index(selected) if selected in self.profiles else 0
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+    
+    def new_profile(self):
+        from tkinter import simpledialog
+        name = simpledialog.askstring("New Profile", "Profile name:", parent=self)
+        if name is None:
+            return
+        if not is_valid_name(name):
+            messagebox.showerror("Invalid Name", "Profile names cannot contain / \\ : * ? \" < > |", parent=self)
+            return
+        create_profile(self.log_dir, name)
+        self.fill(name)
+    
+    def open_profile(self):
+        selection = self.listbox.curselection()
+        if selection:
+            self.choice = self.profiles[selection[0]]
+            self.destroy()
+
+def choose_profile(root, log_dir):
+    """Asks which profile to use when there is more than the default one.
+    Returns None if the dialog was closed without choosing."""
+    if len(list_profiles(log_dir)) == 1:
+        return DEFAULT_PROFILE
+    root.withdraw()
+    selector = ProfileSelector(root, log_dir)
+    root.wait_window(selector)
+    root.deiconify()
+    return selector.choice
+
 class CSVManager:
+    # Listbox rows are inserted in batches so large libraries open instantly
+    LIST_BATCH_SIZE = 200
+    
     def __init__(self, root, csv_dir="practice_files"):
         self.root = root
         self.csv_dir = csv_dir
         self.current_file = None
+        self.index = None
         
         # Create directory if it doesn't exist
         if not os.path.exists(csv_dir):
@@ -214,6 +867,7 @@ class CSVManager:
     
     def create_new_csv(self):
         """Creates a new CSV file with a user-specified name"""
+        from tkinter import simpledialog
         filename = simpledialog.askstring("New Practice File", "Enter file name (without .csv):")
         if filename:
             if not filename.endswith('.csv'):
@@ -240,6 +894,8 @@ class CSVManager:
         if filename:
             try:
                 os.remove(filename)
+                if os.path.exists(filename + CACHE_SUFFIX):
+                    os.remove(filename + CACHE_SUFFIX)
                 return True
             except Exception as e:
                 messagebox.showerror("Error", f"Could not delete file: {e}")
@@ -250,9 +906,25 @@ class CSVManager:
         # Create selection dialog
         dialog = tk.Toplevel(self.root)
         dialog.title("Select Practice File")
-        dialog.geometry("400x300")
+        dialog.geometry("500x400")
         dialog.configure(bg='#1a1a2e')
         
+        # Metadata comes from the persisted index; only changed files are re-read
+        if self.index is None:
+            self.index = PracticeIndex(self.csv_dir)
+        self.index.refresh()
+        
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(
+            dialog,
+            textvariable=search_var,
+            bg='#16213e',
+            fg='white',
+            insertbackground='white',
+            font=('Roboto', 12)
+        )
+        search_entry.pack(pady=(20, 0), padx=20, fill=tk.X)
+        
         # List available CSV files
         listbox = tk.Listbox(
             dialog,
@@ -261,11 +933,30 @@ class CSVManager:
             selectmode=tk.SINGLE,
             font=('Roboto', 12)
         )
-        listbox.pack(pady=20, padx=20, fill=tk.BOTH, expand=True)
+        listbox.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
+        
+        shown = []
+        fill_job = [None]
+        
+        def fill(start=0):
+            fill_job[0] = None
+            end = min(len(shown), start + self.LIST_BATCH_SIZE)
+            for name in shown[start:end]:
+                chords, total = self.index.info(name)
+                listbox.insert(tk.END, f"{name}  ({chords} chords, {format_seconds(total)} sec)")
+            if end < len(shown):
+                fill_job[0] = dialog.after_idle(fill, end)
         
-        for file in os.listdir(self.csv_dir):
-            if file.endswith('.csv'):
-                listbox.insert(tk.END, file)
+        def apply_filter(*args):
+            if fill_job[0]:
+                dialog.after_cancel(fill_job[0])
+            shown[:] = self.index.search(search_var.get())
+            listbox.delete(0, tk.END)
+            fill()
+        
+        search_var.trace_add('write', apply_filter)
+        apply_filter()
+        search_entry.focus_set()
         
         button_frame = tk.Frame(dialog, bg='#1a1a2e')
         button_frame.pack(pady=10, fill=tk.X)
@@ -273,7 +964,7 @@ class CSVManager:
         def select():
             selection = listbox.curselection()
             if selection:
-                filename = listbox.get(selection[0])
+                filename = shown[selection[0]]
                 self.current_file = os.path.join(self.csv_dir, filename)
                 dialog.destroy()
         
@@ -286,11 +977,13 @@ class CSVManager:
         def delete_selected():
             selection = listbox.curselection()
             if selection:
-                filename = listbox.get(selection[0])
+                filename = shown[selection[0]]
                 filepath = os.path.join(self.csv_dir, filename)
                 
                 if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {filename}?"):
                     if self.delete_csv(filepath):
+                        self.index.remove(filename)
+                        del shown[selection[0]]
                         listbox.delete(selection)
                         if filepath == self.current_file:
                             self.current_file = None
@@ -329,32 +1022,84 @@ class CSVManager:
         return self.current_file
 
 class GuitarChordPracticeApp:
-    def __init__(self, root):
+    # How often the current practice file is checked for external edits
+    WATCH_INTERVAL_MS = 50
+    # How often --perf-profile metrics are written out
+    PERF_WRITE_MS = 10000
+    
+    def __init__(self, root, diagnostics=False, event_fsync='interval', profile=DEFAULT_PROFILE, audio='off'):
         self.root = root
-        self.root.title("Guitar Practice")
+        self.profile = profile
+        self.root.title("Guitar Practice" if profile == DEFAULT_PROFILE else f"Guitar Practice - {profile}")
         self.root.geometry("500x700")
         self.root.resizable(False, False)
         self.root.configure(bg='#1a1a2e')
-        
-        # Initialize all attributes
-        self.start_time = None
-        self.end_time = None
-        self.current_note = None
-        self.running = False
-        self.stop_event = Event()
-        self.note_data = {}
-        self.notes = []
-        self.global_interval = 15
+        # Set by switch_profile when the app should restart on another profile
+        self.next_profile = None
         
         # Initialize CSV manager
         self.csv_manager = CSVManager(root)
         self.current_notes_file = None
+        self.notes_watcher = None
         
-        # Create log file path
-        self.log_dir = "practice_logs"
+        # Create log file path; every profile logs to its own shard
+        self.log_dir = profile_dir(DEFAULT_LOG_DIR, profile)
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
-        self.log_file = os.path.join(self.log_dir, "session_log.csv")
+        self.session_store = open_session_store(self.log_dir)
+        # Kept by the last closed progress window for the next one
+        self.loaded_log = None
+        
+        # Log any session a crash or kill left in the journal last time
+        journal = SessionJournal(os.path.join(self.log_dir, JOURNAL_NAME))
+        try:
+            recovered = journal.recover(self.session_store)
+        except Exception as e:
+            print(f"Error recovering session: {e}")
+            recovered = None
+        if recovered:
+            start, end, duration = recovered
+            messagebox.showinfo(
+                "Session Recovered",
+                f"An unfinished session from {start} to {end} ({duration} seconds) was saved to your progress."
+            )
+        
+        # Session logic lives in the GUI-free core; the app only displays it
+        self.session = PracticeSession(
+            self.root.after,
+            self.root.after_cancel,
+            self.session_store,
+            on_chord=self.display_chord,
+            on_tick=self.display_remaining
+        )
+        self.session.journal = journal
+        
+        # Per-chord events are written off the UI thread in batches
+        self.session.event_log = ChordEventWriter(
+            os.path.join(self.log_dir, EVENT_LOG_NAME),
+            fsync=event_fsync
+        ).start()
+        
+        # Optional audio cues; numpy (and the audio device) only load when asked for
+        if audio != 'off':
+            from audio_cues import open_audio
+            try:
+                self.session.audio = open_audio(audio)
+            except RuntimeError as e:
+                messagebox.showwarning("Audio Cues", f"{e}\n\nPracticing without sound.")
+        
+        # Opt-in profiling exports (enabled in main); rewritten periodically
+        # so they can be read while the app runs
+        if perf_metrics.registry is not None:
+            self.root.after(self.PERF_WRITE_MS, self.write_perf_metrics)
+        
+        # Opt-in timer/UI latency instrumentation
+        self.recorder = None
+        if diagnostics:
+            from instrumentation import TimingRecorder
+            self.recorder = TimingRecorder()
+            self.session.timer.observer = self.recorder.observe_timer
+            self.recorder.start_heartbeat(self.root.after)
         
         # Register exit handlers
         atexit.register(self.on_exit)
@@ -411,19 +1156,28 @@ class GuitarChordPracticeApp:
                 self.root.destroy()
     
     def load_notes(self):
-        self.note_data = {}
         try:
-            with open(self.current_notes_file, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                for row in csv_reader:
-                    self.note_data[row['Type']] = row['Duration']
-            self.notes = list(self.note_data.keys())
+            self.session.load_notes(self.current_notes_file)
+            self.watch_notes_file()
         except Exception as e:
             messagebox.showerror("Error", f"Could not load notes: {e}")
     
-    def get_note_interval(self, note):
-        duration = self.note_data.get(note, 'default')
-        return int(duration) if duration != 'default' else self.global_interval
+    def watch_notes_file(self):
+        if self.notes_watcher and self.notes_watcher.path == self.current_notes_file:
+            return
+        if self.notes_watcher:
+            self.notes_watcher.close()
+        else:
+            self.root.after(self.WATCH_INTERVAL_MS, self.check_notes_file)
+        self.notes_watcher = FileWatcher(self.current_notes_file)
+    
+    def check_notes_file(self):
+        try:
+            if self.notes_watcher.check():
+                self.session.reload_notes()
+        except Exception as e:
+            print(f"Error reloading notes: {e}")
+        self.root.after(self.WATCH_INTERVAL_MS, self.check_notes_file)
     
     def create_ui(self):
         main_frame = tk.Frame(self.root, bg='#1a1a2e', width=460, height=660)
@@ -447,7 +1201,7 @@ class GuitarChordPracticeApp:
         
         self.timer_label = tk.Label(
             main_frame, 
-            text=f"Next in: {self.global_interval} sec", 
+            text=f"Next in: {format_seconds(self.session.global_interval)} sec", 
             font=("Roboto", 20), 
             bg='#16213e', 
             fg='#0f3460',
@@ -468,7 +1222,7 @@ class GuitarChordPracticeApp:
             justify='center'
         )
         self.interval_entry.pack(side=tk.LEFT, padx=5)
-        self.interval_entry.insert(0, str(self.global_interval))
+        self.interval_entry.insert(0, format_seconds(self.session.global_interval))
         
         tk.Label(
             interval_frame, 
@@ -477,6 +1231,16 @@ class GuitarChordPracticeApp:
             fg='#e94560'
         ).pack(side=tk.LEFT)
         
+        self.mode_var = tk.StringVar(value=self.session.sampler.mode)
+        mode_menu = tk.OptionMenu(
+            interval_frame,
+            self.mode_var,
+            *ChordSampler.MODES,
+            command=self.session.sampler.set_mode
+        )
+        mode_menu.config(bg='#0f3460', fg='#e94560', highlightthickness=0)
+        mode_menu.pack(side=tk.LEFT, padx=(15, 0))
+        
         button_frame = tk.Frame(main_frame, bg='#1a1a2e')
         button_frame.pack(pady=(10, 20), fill=tk.X)
         
@@ -530,6 +1294,42 @@ class GuitarChordPracticeApp:
         )
         progress_button.pack(pady=(10, 0))
         
+        # Always offered, so a new profile can be made without the CLI
+        tk.Button(
+            main_frame, 
+            text="Switch Profile", 
+            command=self.switch_profile,
+            bg='#0f3460', 
+            fg='#e94560',
+            font=("Roboto", 10, "bold"),
+            borderwidth=2,
+            relief=tk.RAISED
+        ).pack(pady=(10, 0))
+        
+        if len(list_profiles(DEFAULT_LOG_DIR)) > 1:
+            tk.Button(
+                main_frame, 
+                text="All Profiles", 
+                command=lambda: ProfileDashboard(self.root, DEFAULT_LOG_DIR),
+                bg='#0f3460', 
+                fg='#e94560',
+                font=("Roboto", 10, "bold"),
+                borderwidth=2,
+                relief=tk.RAISED
+            ).pack(pady=(10, 0))
+        
+        if self.recorder:
+            tk.Button(
+                main_frame, 
+                text="Diagnostics", 
+                command=lambda: DiagnosticsPanel(self.root, self.recorder),
+                bg='#0f3460', 
+                fg='#e94560',
+                font=("Roboto", 10, "bold"),
+                borderwidth=2,
+                relief=tk.RAISED
+            ).pack(pady=(10, 0))
+        
         self.session_label = tk.Label(
             main_frame, 
             text="Session: Not Started", 
@@ -575,111 +1375,199 @@ class GuitarChordPracticeApp:
             messagebox.showwarning("File Not Found", f"{filename} does not exist.")
             return
         
-        subprocess.Popen(['notepad.exe', filename])
+        if sys.platform == 'win32':
+            subprocess.Popen(['notepad.exe', filename])
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', '-t', filename])
+        else:
+            subprocess.Popen(['xdg-open', filename])
         
-        # Reload notes after Notepad is closed
-        self.load_notes()
+        # Saved edits are picked up by the practice file watcher
     
     def change_practice_file(self):
-        if self.running:
+        if self.session.running:
             self.stop()
         self.select_practice_file()
         if self.current_notes_file:
             self.load_notes()
             self.chord_label.config(text="Press Start")
     
-    def display_random_chord(self):
-        while self.running and not self.stop_event.is_set():
-            self.current_note = random.choice(self.notes)
-            note_interval = self.get_note_interval(self.current_note)
-            
-            self.chord_label.config(text=self.current_note)
-            self.next_button.config(state=tk.NORMAL)
-            
-            for remaining in range(note_interval, 0, -1):
-                if not self.running or self.stop_event.is_set():
-                    break
-                self.timer_label.config(text=f"Next in: {remaining} sec")
-                time.sleep(1)
-            
-            self.stop_event.clear()
-            
-            if not self.running:
-                break
+    def display_chord(self, note, interval):
+        """Shows a new chord; called by the practice timer on the Tk thread"""
+        self.chord_label.config(text=note)
+        self.next_button.config(state=tk.NORMAL)
+    
+    def display_remaining(self, remaining):
+        self.timer_label.config(text=f"Next in: {format_seconds(remaining)} sec")
     
     def force_next(self):
-        self.stop_event.set()
+        self.session.force_next()
     
     def view_progress(self):
-        ProgressViewer(self.root, self.log_file)
+        # A second viewer open at the same time reads the log on its own
+        loaded_log, self.loaded_log = self.loaded_log, None
+        ProgressViewer(self.root, self.session_store, loaded_log, on_closed=self.keep_loaded_log)
+    
+    def keep_loaded_log(self, loaded_log):
+        if self.loaded_log:
+            self.loaded_log.store.close()
+        self.loaded_log = loaded_log
     
     def on_close(self):
-        if self.running:
+        if self.session.running:
             self.stop()
         self.root.destroy()
     
-    def on_exit(self):
-        if self.start_time and not self.end_time:
-            self.end_time = datetime.now()
-            self.save_progress(None, None)
+    def switch_profile(self):
+        """Picks or creates a profile; the app is then closed and main()
+        starts it again on the new profile's log"""
+        selector = ProfileSelector(self.root, DEFAULT_LOG_DIR, self.profile)
+        self.root.wait_window(selector)
+        if selector.choice is None or selector.choice == self.profile:
+            return
+        self.next_profile = selector.choice
+        self.on_close()
+        atexit.unregister(self.on_exit)
+        self.on_exit()
     
-    def save_progress(self, chord, interval):
+    def write_perf_metrics(self):
         try:
-            file_exists = os.path.exists(self.log_file)
-            with open(self.log_file, 'a', newline='') as file:
-                writer = csv.writer(file)
-                if not file_exists:
-                    writer.writerow(["Session Start", "Session End", "Duration (seconds)"])
-                
-                if self.start_time and self.end_time:
-                    duration = int((self.end_time - self.start_time).total_seconds())
-                    writer.writerow([
-                        self.start_time.strftime('%Y-%m-%d %H:%M:%S'), 
-                        self.end_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        duration
-                    ])
+            perf_metrics.write(self.log_dir)
+        except Exception as e:
+            print(f"Error saving performance metrics: {e}")
+        self.root.after(self.PERF_WRITE_MS, self.write_perf_metrics)
+    
+    def on_exit(self):
+        if self.session.running:
+            try:
+                # Tk is already gone here, so pending after() jobs can't be cancelled
+                self.session.stop(cancel_pending=False)
+            except Exception as e:
+                print(f"Error saving progress: {e}")
+        self.session.event_log.close()
+        if self.loaded_log:
+            self.loaded_log.store.close()
+        if self.session.audio:
+            self.session.audio.close()
+        if self.recorder:
+            try:
+                self.recorder.dump(os.path.join(self.log_dir, "diagnostics.json"))
+            except Exception as e:
+                print(f"Error saving diagnostics: {e}")
+        try:
+            perf_metrics.write(self.log_dir, final=True)
         except Exception as e:
-            print(f"Error saving progress: {e}")
+            print(f"Error saving performance metrics: {e}")
     
     def start(self):
-        if not self.running:
+        if not self.session.running:
+            if not self.session.notes:
+                messagebox.showwarning("No Chords", "The current practice file has no chords.")
+                return
+            
             try:
-                new_interval = int(self.interval_entry.get())
+                new_interval = float(self.interval_entry.get())
                 if new_interval > 0:
-                    self.global_interval = new_interval
+                    self.session.global_interval = new_interval
             except ValueError:
                 pass
             
-            self.start_time = datetime.now()
-            self.running = True
-            self.session_label.config(text=f"Session Started: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            
             self.start_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.NORMAL)
             
-            self.thread = Thread(target=self.display_random_chord, daemon=True)
-            self.thread.start()
+            self.session.start()
+            self.session_label.config(text=f"Session Started: {self.session.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     def stop(self):
-        if self.running:
-            self.running = False
-            self.stop_event.set()
-            self.end_time = datetime.now()
-            
-            self.save_progress(None, None)
+        if self.session.running:
+            try:
+                duration = self.session.stop()
+            except Exception as e:
+                print(f"Error saving progress: {e}")
+                duration = self.session.duration()
             
-            self.session_label.config(text=f"Session Ended. Total Time: {int((self.end_time - self.start_time).total_seconds())} seconds")
+            self.session_label.config(text=f"Session Ended. Total Time: {duration} seconds")
             
             self.chord_label.config(text="Press Start")
-            self.timer_label.config(text=f"Next in: {self.global_interval} sec")
+            self.timer_label.config(text=f"Next in: {format_seconds(self.session.global_interval)} sec")
             self.start_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
             self.next_button.config(state=tk.DISABLED)
 
+def report_first_window(root, path):
+    root.update_idletasks()
+    with open(path, 'w') as file:
+        file.write(repr(time.time()))
+    root.destroy()
+
 def main():
+    parser = argparse.ArgumentParser(description="Guitar Practice")
+    parser.add_argument(
+        '--diagnostics',
+        action='store_true',
+        help="record timer jitter and UI stalls; writes practice_logs/diagnostics.json on exit"
+    )
+    parser.add_argument(
+        '--event-fsync',
+        choices=FSYNC_POLICIES,
+        default='interval',
+        help="when the per-chord event log is fsynced (default: every few seconds)"
+    )
+    parser.add_argument(
+        '--profile',
+        help="whose practice log to use (created if new); skips the profile selector"
+    )
+    parser.add_argument(
+        '--audio',
+        choices=('off', 'clicks', 'chords', 'both'),
+        default='off',
+        help="play a click per countdown tick and/or a tone per new chord (needs numpy and sounddevice)"
+    )
+    parser.add_argument(
+        '--perf-profile',
+        action='store_true',
+        help="time hot paths; writes perf_metrics.prom and perf_metrics.json to the log directory"
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help="also write cProfile stats to perf.pstats on exit (implies --perf-profile)"
+    )
+    parser.add_argument(
+        '--tracemalloc',
+        action='store_true',
+        help="also record memory use and the top allocation sites (implies --perf-profile)"
+    )
+    args = parser.parse_args()
+    if args.profile and not is_valid_name(args.profile):
+        parser.error(f"Invalid profile name: {args.profile!r}")
+    if args.perf_profile or args.cprofile or args.tracemalloc:
+        perf_metrics.enable(cprofile=args.cprofile, trace_memory=args.tracemalloc)
+    
     root = tk.Tk()
-    app = GuitarChordPracticeApp(root)
-    root.mainloop()
+    profile = args.profile or choose_profile(root, DEFAULT_LOG_DIR)
+    if profile is None:
+        root.destroy()
+        return
+    while True:
+        app = GuitarChordPracticeApp(
+            root,
+            diagnostics=args.diagnostics,
+            event_fsync=args.event_fsync,
+            profile=profile,
+            audio=args.audio
+        )
+        probe = os.environ.get(STARTUP_PROBE_ENV_VAR)
+        if probe:
+            root.after_idle(report_first_window, root, probe)
+        root.mainloop()
+        if app.next_profile is None:
+            break
+        profile = app.next_profile
+        root = tk.Tk()
 
 if __name__ == "__main__":
+    # The profile dashboard's worker processes re-run this script in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
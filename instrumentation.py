@@ -0,0 +1,99 @@
+import json
+import math
+import time
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size float buffer keeping the most recent `size` samples"""
+
+    def __init__(self, size):
+        self.data = array('d', [0.0]) * size
+        self.size = size
+        self.pos = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count].tolist()
+        return (self.data[self.pos:] + self.data[:self.pos]).tolist()
+
+    def __len__(self):
+        return self.count
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list. The product is
+    rounded first so float error (0.07 * 100 = 7.000000000000001) can't
+    push the rank up by one."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(round(fraction * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+
+class TimingRecorder:
+    """Opt-in timing diagnostics for the practice timer and the UI loop.
+
+    Samples are kept in seconds, per metric, in fixed-size ring buffers:
+      tick_late / chord_late - scheduled time to the moment the countdown
+                               or chord widget update finished
+      widget_update          - time spent inside the widget update itself
+      loop_stall             - how much later than requested a heartbeat
+                               callback ran, i.e. how long the loop was busy
+    """
+
+    METRICS = ("tick_late", "chord_late", "widget_update", "loop_stall")
+    HEARTBEAT_MS = 20
+
+    def __init__(self, size=4096, clock=time.monotonic):
+        self.clock = clock
+        self.buffers = {metric: RingBuffer(size) for metric in self.METRICS}
+        self.totals = {metric: 0 for metric in self.METRICS}
+        self.heartbeat_job = None
+
+    def record(self, metric, seconds):
+        self.buffers[metric].append(seconds)
+        self.totals[metric] += 1
+
+    def observe_timer(self, kind, scheduled, started, finished):
+        """PracticeTimer observer hook"""
+        self.record("chord_late" if kind == "chord" else "tick_late", finished - scheduled)
+        self.record("widget_update", finished - started)
+
+    def start_heartbeat(self, schedule):
+        """Measures event-loop stalls with a periodic after() callback"""
+        self._schedule = schedule
+        self._expected = self.clock() + self.HEARTBEAT_MS / 1000
+        self.heartbeat_job = schedule(self.HEARTBEAT_MS, self._heartbeat)
+
+    def _heartbeat(self):
+        now = self.clock()
+        self.record("loop_stall", max(0.0, now - self._expected))
+        self._expected = now + self.HEARTBEAT_MS / 1000
+        self.heartbeat_job = self._schedule(self.HEARTBEAT_MS, self._heartbeat)
+
+    def summary(self):
+        """Per metric: sample count and p50/p95/p99/max in milliseconds"""
+        summary = {}
+        for metric, buffer in self.buffers.items():
+            values = sorted(buffer.values())
+            summary[metric] = {
+                "count": self.totals[metric],
+                "window": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+                "max_ms": (values[-1] if values else 0.0) * 1000,
+            }
+        return summary
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
@@ -0,0 +1,157 @@
+"""Streaming merge of session logs from several machines.
+
+Each input is streamed in start-time order: a log that already is in order
+is read as is, anything else is external-sorted into sorted runs on disk
+first. The ordered inputs are then k-way merged with a heap, duplicates are
+dropped on the fly and the result is written out as a single CSV log. Only
+one chunk of rows (during external sort) and one open row per input are
+ever held in memory, so inputs can be far larger than RAM.
+"""
+import csv
+import heapq
+import os
+import shutil
+import tempfile
+
+from session_store import CSV_HEADER, CSVSessionStore, parse_csv_rows
+
+DEFAULT_CHUNK_ROWS = 500000
+
+
+class MergeStats:
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.duplicates = 0
+        self.overlaps = 0
+        self.sorted_inputs = 0
+        self.runs = 0
+
+
+def open_log(path):
+    """A CSV session log, or a log directory (including its sealed segments)"""
+    if os.path.isdir(path):
+        path = os.path.join(path, "session_log.csv")
+    return CSVSessionStore(path)
+
+
+def is_ordered(store):
+    previous = None
+    for row in store.iter_sessions():
+        if previous is not None and row < previous:
+            return False
+        previous = row
+    return True
+
+
+def write_run(rows, directory):
+    handle, path = tempfile.mkstemp(suffix='.csv', dir=directory)
+    with os.fdopen(handle, 'w', newline='') as file:
+        csv.writer(file).writerows(rows)
+    return path
+
+
+def read_run(path):
+    with open(path, 'r', newline='') as file:
+        yield from parse_csv_rows(csv.reader(file))
+
+
+def sorted_sessions(store, chunk_rows, tmp_dir, stats):
+    """Yields a log's sessions ordered by (start, end, duration)"""
+    if is_ordered(store):
+        stats.sorted_inputs += 1
+        return store.iter_sessions()
+
+    # External sort: sorted runs of chunk_rows sessions, merged back lazily
+    runs = []
+    chunk = []
+    for row in store.iter_sessions():
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            chunk.sort()
+            runs.append(write_run(chunk, tmp_dir))
+            chunk = []
+    chunk.sort()
+    if not runs:
+        return iter(chunk)
+    if chunk:
+        runs.append(write_run(chunk, tmp_dir))
+    stats.runs += len(runs)
+    return heapq.merge(*(read_run(path) for path in runs))
+
+
+def dedupe(rows, stats, drop_overlaps=True):
+    """Drops repeated sessions from a start-ordered stream.
+
+    Identical sessions share a start time, so only the rows of the current
+    start time are kept in a hash set. With drop_overlaps, a session that
+    starts before the previous one ended is taken to be the same practice
+    logged on another machine, and the longer of the two is kept.
+    """
+    pending = None
+    seen = set()
+    current_start = None
+    for row in rows:
+        stats.read += 1
+        if row[0] != current_start:
+            current_start = row[0]
+            seen.clear()
+        if row in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(row)
+
+        if pending is not None and drop_overlaps and row[0] < pending[1]:
+            stats.overlaps += 1
+            if row[2] > pending[2]:
+                pending = row
+            continue
+        if pending is not None:
+            yield pending
+        pending = row
+    if pending is not None:
+        yield pending
+
+
+def merge_logs(inputs, output, chunk_rows=None, drop_overlaps=True):
+    """Merges session logs into one CSV log at output; returns MergeStats.
+
+    output may be one of the inputs: the merged log is written to a
+    temporary file first and only then replaces it. chunk_rows defaults
+    to DEFAULT_CHUNK_ROWS.
+    """
+    chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+    stats = MergeStats()
+    tmp_dir = tempfile.mkdtemp(prefix='session_merge_', dir=os.path.dirname(os.path.abspath(output)))
+    try:
+        streams = [sorted_sessions(open_log(path), chunk_rows, tmp_dir, stats) for path in inputs]
+        merged_path = os.path.join(tmp_dir, 'merged.csv')
+        with open(merged_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            for row in dedupe(heapq.merge(*streams), stats, drop_overlaps):
+                writer.writerow(row)
+                stats.written += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(merged_path, output)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return stats
+
+
+def import_logs(store, inputs, chunk_rows=None, drop_overlaps=True):
+    """Merges other logs into a CSVSessionStore's own log; returns MergeStats.
+
+    The merged log (which includes every sealed month) replaces the active
+    log, the old segments are removed and finished months are sealed again.
+    If this is interrupted part way, importing again repairs the log, as
+    the repeated sessions are dropped as duplicates.
+    """
+    stats = merge_logs([store.path] + list(inputs), store.path, chunk_rows, drop_overlaps)
+    for segment in store.segments():
+        os.remove(segment.path)
+    if os.path.exists(store.aggregate_path):
+        os.remove(store.aggregate_path)
+    store.rotate()
+    return stats
@@ -0,0 +1,232 @@
+"""Opt-in profiling of the app's hot paths.
+
+Hot paths are wrapped with @timed(name), or bracketed with start(name) and
+Span.finish() when the work spans several callbacks. Each span's duration
+goes into a histogram, and count(name) bumps a counter. write() exports
+everything to a directory as:
+  perf_metrics.prom  - Prometheus text format (e.g. for node_exporter's
+                       textfile collector)
+  perf_metrics.json  - the same numbers, plus tracemalloc's top allocations
+  perf.pstats        - cProfile statistics, on the final write only
+
+Until enable() is called the registry is None: a @timed call then costs one
+global lookup on top of the call itself, and count()/start() return at once.
+"""
+import bisect
+import functools
+import json
+import os
+import time
+
+# Histogram bucket upper bounds in seconds, Prometheus style
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "guitar_practice_"
+PROMETHEUS_NAME = "perf_metrics.prom"
+JSON_NAME = "perf_metrics.json"
+PSTATS_NAME = "perf.pstats"
+TRACEMALLOC_TOP = 25
+
+registry = None
+
+
+class Histogram:
+    def __init__(self):
+        # counts[i] holds values in (BUCKETS[i - 1], BUCKETS[i]]; the last is +Inf
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self):
+        """(upper bound, count of values <= it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class MetricsRegistry:
+    """Counters and span histograms, with optional cProfile and tracemalloc"""
+
+    def __init__(self, cprofile=False, trace_memory=False, clock=time.perf_counter):
+        self.clock = clock
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.profiler = None
+        self.trace_memory = trace_memory
+        if cprofile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def memory(self):
+        """(current bytes, peak bytes, top allocation sites) or None"""
+        if not self.trace_memory:
+            return None
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:TRACEMALLOC_TOP]
+        top = [
+            {"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "bytes": stat.size, "count": stat.count}
+            for stat in stats
+        ]
+        return current, peak, top
+
+    def prometheus(self, memory=None):
+        lines = [
+            f"# HELP {METRIC_PREFIX}uptime_seconds Seconds since profiling was enabled",
+            f"# TYPE {METRIC_PREFIX}uptime_seconds gauge",
+            f"{METRIC_PREFIX}uptime_seconds {time.time() - self.started:.3f}",
+        ]
+        for name in sorted(self.counters):
+            metric = f"{METRIC_PREFIX}{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {self.counters[name]}"]
+
+        if self.histograms:
+            metric = f"{METRIC_PREFIX}span_seconds"
+            lines += [f"# HELP {metric} Time spent in instrumented code paths",
+                      f"# TYPE {metric} histogram"]
+            for name in sorted(self.histograms):
+                histogram = self.histograms[name]
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{le}"}} {count}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{{span="{name}"}} {histogram.count}')
+
+        if memory:
+            current, peak, _ = memory
+            for label, value in (("current", current), ("peak", peak)):
+                metric = f"{METRIC_PREFIX}tracemalloc_{label}_bytes"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self, memory=None):
+        report = {
+            "meta": {
+                "started": self.started,
+                "written": time.time(),
+                "pid": os.getpid(),
+            },
+            "counters": dict(self.counters),
+            "spans": {
+                name: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "max": histogram.max,
+                    "buckets": {
+                        "+Inf" if bound == float('inf') else f"{bound:g}": count
+                        for bound, count in histogram.cumulative()
+                    },
+                }
+                for name, histogram in self.histograms.items()
+            },
+        }
+        if memory:
+            current, peak, top = memory
+            report["tracemalloc"] = {"current": current, "peak": peak, "top": top}
+        return report
+
+    def write(self, directory, final=False):
+        memory = self.memory()
+        write_atomic(os.path.join(directory, PROMETHEUS_NAME), self.prometheus(memory))
+        write_atomic(os.path.join(directory, JSON_NAME), json.dumps(self.as_dict(memory), indent=2))
+        if final and self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(os.path.join(directory, PSTATS_NAME))
+
+    def close(self):
+        if self.profiler:
+            self.profiler.disable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+
+def write_atomic(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as file:
+        file.write(text)
+    os.replace(tmp_path, path)
+
+
+class Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+        self.started = registry.clock()
+
+    def finish(self):
+        if registry is not None:
+            registry.observe(self.name, registry.clock() - self.started)
+
+
+def enable(cprofile=False, trace_memory=False):
+    global registry
+    if registry is None:
+        registry = MetricsRegistry(cprofile, trace_memory)
+    return registry
+
+
+def disable():
+    global registry
+    if registry is not None:
+        registry.close()
+        registry = None
+
+
+def timed(name):
+    """Decorator recording each call's duration as span `name`"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if registry is None:
+                return function(*args, **kwargs)
+            started = registry.clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if registry is not None:
+                    registry.observe(name, registry.clock() - started)
+        return wrapper
+    return decorate
+
+
+def start(name):
+    """A Span to finish() later, or None when profiling is off"""
+    return Span(name) if registry is not None else None
+
+
+def count(name, amount=1):
+    if registry is not None:
+        registry.count(name, amount)
+
+
+def write(directory, final=False):
+    if registry is not None:
+        registry.write(directory, final)
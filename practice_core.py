@@ -0,0 +1,603 @@
+"""GUI-free core of Guitar Practice: session engine, practice file loading
+and session logging, plus a command line interface.
+
+    python -m practice_core run practice_files/default_chords.csv --minutes 10
+    python -m practice_core simulate practice_files/default_chords.csv --sessions 50
+    python -m practice_core replay practice_files/default_chords.csv --speed 60
+    python -m practice_core stats
+    python -m practice_core --profile alice run practice_files/default_chords.csv
+    python -m practice_core compact
+    python -m practice_core merge merged.csv laptop/session_log.csv desktop/practice_logs
+    python -m practice_core dashboard
+    python -m practice_core --perf-profile --cprofile simulate practice_files/default_chords.csv
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import perf_metrics
+from chord_sampler import ChordSampler
+from event_log import FSYNC_POLICIES, ChordEventWriter
+from practice_files import diff_practice_files, load_practice_file
+from practice_timer import PracticeTimer
+from profiles import DEFAULT_PROFILE, list_profiles, load_profile_aggregates, merge_aggregates, profile_dir
+from session_journal import SessionJournal
+from session_store import TIME_FORMAT, open_session_store
+
+DEFAULT_LOG_DIR = "practice_logs"
+EVENT_LOG_NAME = "chord_events.csv"
+JOURNAL_NAME = "session.journal"
+DEFAULT_INTERVAL = 15
+
+
+class PracticeSession:
+    """Chord selection, timing and logging for one practice window.
+
+    Scheduling goes through after()-style callables, so the same engine
+    runs under Tk (root.after) or the headless EventLoop below. on_chord
+    is called with (note, interval) for every new chord and on_tick with
+    the seconds remaining before the next one.
+
+    If event_log is set (a ChordEventWriter), every chord shown is also
+    recorded with its dwell time and whether it was skipped with Next. If
+    journal is set (a SessionJournal), the running session is checkpointed
+    every CHECKPOINT_INTERVAL seconds so a crash loses at most that much.
+    If audio is set (an AudioCues), chord changes and countdown ticks play
+    its cues, rendered whenever chords are loaded or a session starts.
+    """
+
+    CHECKPOINT_INTERVAL = 1.0
+
+    def __init__(self, schedule, cancel, session_store, on_chord=None, on_tick=None,
+                 clock=time.monotonic, now=datetime.now):
+        self.session_store = session_store
+        self.on_chord = on_chord or (lambda note, interval: None)
+        self.on_tick = on_tick or (lambda remaining: None)
+        self.now = now
+
+        self.notes_file = None
+        self.practice = None
+        self.note_data = {}
+        self.notes = []
+        self.global_interval = DEFAULT_INTERVAL
+        self.sampler = ChordSampler()
+        self.timer = PracticeTimer(schedule, cancel, self._next_chord, self._tick, clock)
+
+        self.start_time = None
+        self.end_time = None
+        self.current_note = None
+        self.running = False
+
+        self.clock = clock
+        self.schedule = schedule
+        self.cancel = cancel
+        self.journal = None
+        self.audio = None
+        self.checkpoint_job = None
+        self.event_log = None
+        self.shown_at = None
+        self.shown_clock = None
+        self.skipping = False
+
+    @perf_metrics.timed('load_notes')
+    def load_notes(self, path):
+        """Loads a practice file; raises on errors"""
+        practice = load_practice_file(path)
+        self.notes_file = path
+        self.practice = practice
+        self.note_data = practice.interval_map()
+        self.notes = practice.notes
+        self.sampler.set_notes(self.notes, practice.weights)
+        if self.audio:
+            self.audio.prepare(self.notes)
+
+    @perf_metrics.timed('reload_notes')
+    def reload_notes(self):
+        """Applies edits to the current practice file without interrupting a
+        running session: the current chord and countdown carry on and the
+        sampler keeps its place in the current cycle. Returns True if any
+        chord changed."""
+        practice = load_practice_file(self.notes_file)
+        if not practice.notes:
+            return False  # Keep practicing the old chords until the file has some
+        added, removed, changed = diff_practice_files(self.practice, practice)
+        if not (added or removed or changed):
+            return False
+
+        self.practice = practice
+        self.notes = practice.notes
+        self.note_data = practice.interval_map()
+        self.sampler.update_notes(practice.notes, practice.weights)
+        if self.audio:
+            self.audio.prepare(self.notes)
+        return True
+
+    def get_note_interval(self, note):
+        duration = self.note_data.get(note)
+        return duration if duration is not None else self.global_interval
+
+    def _record_chord_event(self):
+        if self.event_log and self.current_note and self.shown_at:
+            self.event_log.record(
+                self.start_time,
+                self.current_note,
+                self.shown_at,
+                self.clock() - self.shown_clock,
+                self.skipping
+            )
+        self.skipping = False
+
+    def _next_chord(self):
+        self._record_chord_event()
+        self.current_note = self.sampler.draw()
+        perf_metrics.count('chords_shown')
+        self.shown_at = self.now()
+        self.shown_clock = self.clock()
+        interval = self.get_note_interval(self.current_note)
+        self.on_chord(self.current_note, interval)
+        if self.audio:
+            self.audio.chord(self.current_note)
+        return interval
+
+    def _tick(self, remaining):
+        self.on_tick(remaining)
+        if self.audio:
+            self.audio.tick(remaining)
+
+    def start(self):
+        if self.running:
+            return False
+        if not self.notes:
+            raise ValueError("The current practice file has no chords.")
+        self.start_time = self.now()
+        self.end_time = None
+        self.current_note = None
+        self.shown_at = None
+        self.running = True
+        if self.audio:
+            self.audio.prepare(self.notes)
+        if self.journal:
+            self.journal.begin(self.start_time)
+            self.checkpoint_job = self.schedule(int(self.CHECKPOINT_INTERVAL * 1000), self._checkpoint)
+        self.timer.start()
+        return True
+
+    def _checkpoint(self):
+        self.checkpoint_job = None
+        if self.running:
+            self.journal.checkpoint(self.now())
+            self.checkpoint_job = self.schedule(int(self.CHECKPOINT_INTERVAL * 1000), self._checkpoint)
+
+    def force_next(self):
+        if self.running:
+            if self.current_note:
+                self.sampler.record_skip(self.current_note)
+            self.skipping = True
+            perf_metrics.count('chords_skipped')
+            self.timer.force_next()
+
+    def stop(self, cancel_pending=True):
+        """Ends and logs the running session; returns its duration in seconds.
+
+        Pass cancel_pending=False when the scheduler has already shut down,
+        as in an exit handler running after the Tk root was destroyed.
+        """
+        if not self.running:
+            return None
+        self.running = False
+        self.timer.stop(cancel_pending)
+        if self.checkpoint_job is not None:
+            if cancel_pending:
+                self.cancel(self.checkpoint_job)
+            self.checkpoint_job = None
+        self._record_chord_event()
+        self.end_time = self.now()
+        self.save_progress()
+        if self.journal:
+            self.journal.end()
+        return self.duration()
+
+    def duration(self):
+        return int((self.end_time - self.start_time).total_seconds())
+
+    @perf_metrics.timed('save_progress')
+    def save_progress(self):
+        if self.start_time and self.end_time:
+            self.session_store.append(
+                self.start_time.strftime(TIME_FORMAT),
+                self.end_time.strftime(TIME_FORMAT),
+                self.duration()
+            )
+
+
+class EventLoop:
+    """Minimal after()-style scheduler for running sessions without Tk.
+
+    speed scales the clock relative to real time (60 runs a minute per
+    second); speed=None does not wait at all and jumps straight to each
+    scheduled callback, for simulations.
+    """
+
+    def __init__(self, speed=1.0, start=None):
+        self.speed = speed
+        self.start = start or datetime.now()
+        self.queue = []
+        self.cancelled = set()
+        self.counter = 0
+        self.virtual = 0.0
+        self.real_origin = time.monotonic()
+        self.stopped = False
+
+    def clock(self):
+        if self.speed is None:
+            return self.virtual
+        return (time.monotonic() - self.real_origin) * self.speed
+
+    def now(self):
+        return self.start + timedelta(seconds=self.clock())
+
+    def after(self, ms, callback, *args):
+        self.counter += 1
+        heapq.heappush(self.queue, (self.clock() + ms / 1000, self.counter, callback, args))
+        return self.counter
+
+    def after_cancel(self, job):
+        self.cancelled.add(job)
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self, until=None):
+        """Runs callbacks in deadline order until the queue is empty, stop()
+        is called, or the clock reaches `until` seconds"""
+        self.stopped = False
+        while self.queue and not self.stopped:
+            due, job, callback, args = self.queue[0]
+            if until is not None and due > until:
+                break
+            heapq.heappop(self.queue)
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                continue
+            if self.speed is None:
+                self.virtual = max(self.virtual, due)
+            else:
+                wait = (due - self.clock()) / self.speed
+                if wait > 0:
+                    time.sleep(wait)
+            callback(*args)
+
+        if until is not None and not self.stopped:
+            if self.speed is None:
+                self.virtual = max(self.virtual, until)
+            else:
+                wait = (until - self.clock()) / self.speed
+                if wait > 0:
+                    time.sleep(wait)
+
+
+class NullStore:
+    """Session store that discards everything, for unlogged simulations"""
+
+    def append(self, start, end, duration):
+        pass
+
+
+def make_session(loop, store, notes_file, mode=None, interval=None, **callbacks):
+    session = PracticeSession(
+        loop.after, loop.after_cancel, store,
+        clock=loop.clock, now=loop.now, **callbacks
+    )
+    session.load_notes(notes_file)
+    if mode:
+        session.sampler.set_mode(mode)
+    if interval:
+        session.global_interval = interval
+    return session
+
+
+def run_command(args):
+    """Runs a real-time (or --speed scaled) session in the terminal"""
+    store = open_session_store(args.log_dir)
+    if args.audio != 'off':
+        # Imported here so numpy only loads when cues are wanted, and before
+        # the session clock starts
+        from audio_cues import open_audio
+    loop = EventLoop(speed=args.speed)
+
+    def show_chord(note, interval):
+        print(f"\n{note}")
+
+    def show_tick(remaining):
+        print(f"\rNext in: {remaining:g} sec   ", end='', flush=True)
+
+    journal = SessionJournal(os.path.join(args.log_dir, JOURNAL_NAME))
+    recovered = journal.recover(store)
+    if recovered:
+        print(f"Recovered unfinished session {recovered[0]} -> {recovered[1]} ({recovered[2]} sec)")
+
+    session = make_session(loop, store, args.file, args.mode, args.interval,
+                           on_chord=show_chord, on_tick=show_tick)
+    if args.audio != 'off':
+        try:
+            session.audio = open_audio(args.audio, args.audio_wav, loop.clock)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+    session.journal = journal
+    session.event_log = ChordEventWriter(
+        os.path.join(args.log_dir, EVENT_LOG_NAME), fsync=args.event_fsync
+    ).start()
+    session.start()
+    try:
+        loop.run(until=args.minutes * 60 if args.minutes else None)
+    except KeyboardInterrupt:
+        pass
+    duration = session.stop()
+    session.event_log.close()
+    if session.audio:
+        session.audio.close()
+    print(f"\nSession ended. Total time: {duration} seconds")
+
+
+def simulate_command(args):
+    """Simulates sessions on a virtual clock and reports chord statistics"""
+    store = open_session_store(args.log_dir) if args.log else NullStore()
+    rng = random.Random(args.seed)
+    loop = EventLoop(speed=args.speed)
+    shown = Counter()
+    skipped = Counter()
+
+    def show_chord(note, interval):
+        shown[note] += 1
+        if rng.random() < args.skip_rate:
+            skipped[note] += 1
+            loop.after(int(rng.random() * interval * 1000), session.force_next)
+
+    session = make_session(loop, store, args.file, args.mode, args.interval,
+                           on_chord=show_chord)
+    session.sampler.rng = rng
+    if args.log:
+        session.event_log = ChordEventWriter(os.path.join(args.log_dir, EVENT_LOG_NAME), fsync='never').start()
+
+    started = time.perf_counter()
+    for _ in range(args.sessions):
+        session.start()
+        loop.run(until=loop.clock() + args.length)
+        session.stop()
+        # Drop pending skips so they cannot leak into the next session
+        loop.queue.clear()
+        loop.cancelled.clear()
+        # Leave a gap between sessions so their timestamps differ
+        loop.run(until=loop.clock() + args.gap)
+    elapsed = time.perf_counter() - started
+    if session.event_log:
+        session.event_log.close()
+
+    total = sum(shown.values())
+    print(f"Simulated {args.sessions} sessions of {args.length} sec "
+          f"({args.sessions * args.length} sec practice) in {elapsed:.3f} sec")
+    print(f"Chords shown: {total}, skipped: {sum(skipped.values())}")
+    for note, count in shown.most_common(args.top):
+        print(f"  {note:<12} {count:>8}  ({count / total:.1%}, skipped {skipped[note]})")
+
+
+def replay_command(args):
+    """Re-runs logged sessions, each for its logged duration, at --speed"""
+    store = open_session_store(args.log_dir)
+    sessions = store.newest(args.last)[::-1]
+    if not sessions:
+        print("No session logs found.")
+        return
+
+    for start, end, duration in sessions:
+        loop = EventLoop(speed=args.speed, start=datetime.strptime(start, TIME_FORMAT))
+        changes = []
+        session = make_session(loop, NullStore(), args.file, args.mode, args.interval,
+                               on_chord=lambda note, interval: changes.append(note))
+        session.start()
+        loop.run(until=duration)
+        session.stop()
+        print(f"{start} -> {end} ({duration} sec): {len(changes)} chords, "
+              f"{' '.join(changes[:args.show])}{' ...' if len(changes) > args.show else ''}")
+
+
+def stats_command(args):
+    """Prints summary analytics for the session log"""
+    store = open_session_store(args.log_dir)
+    aggregate = store.aggregate()
+    if aggregate.count == 0:
+        print("No session logs found.")
+        return
+
+    mean = aggregate.total / aggregate.count
+    variance = max(0.0, aggregate.sum_sq / aggregate.count - mean * mean)
+    print(f"Total Sessions: {aggregate.count}")
+    print(f"Total Duration: {aggregate.total} sec ({aggregate.total / 3600:.1f} h)")
+    print(f"Avg Session: {mean:.0f} sec (std dev {math.sqrt(variance):.0f} sec)")
+    print(f"Shortest/Longest: {aggregate.min} / {aggregate.max} sec")
+
+    daily = defaultdict(int)
+    for start, _, duration in store.iter_sessions():
+        daily[start[:10]] += duration
+    days = sorted(daily)
+    print(f"Practice days: {len(days)} ({days[0]} to {days[-1]})")
+    best = max(days, key=daily.__getitem__)
+    print(f"Best day: {best} ({daily[best]} sec)")
+    for day in days[-args.days:]:
+        print(f"  {day}  {daily[day]:>7} sec")
+
+
+def compact_command(args):
+    """Seals every finished month of the CSV log into compressed segments"""
+    store = open_session_store(args.log_dir)
+    if not hasattr(store, 'rotate'):
+        print("Only the CSV log is split into monthly segments.")
+        return
+    sealed = store.rotate()
+    print(f"Sealed {sealed} sessions into {store.segment_dir}")
+
+
+def print_merge_stats(stats, inputs):
+    print(f"Read {stats.read} sessions from {inputs} logs "
+          f"({stats.sorted_inputs} already in order, {stats.runs} sorted runs)")
+    print(f"Dropped {stats.duplicates} duplicates and {stats.overlaps} overlapping sessions")
+    print(f"Wrote {stats.written} sessions")
+
+
+def merge_command(args):
+    """Merges session logs (files or log directories) into one CSV log"""
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        print(f"Error: {', '.join(missing)} not found!")
+        return
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    if not os.path.isdir(output_dir):
+        print(f"Error: {output_dir} not found!")
+        return
+    from log_merge import merge_logs  # Not needed on the app's startup path
+    stats = merge_logs(args.inputs, args.output, args.chunk_rows, not args.keep_overlaps)
+    print_merge_stats(stats, len(args.inputs))
+    print(f"Merged log written to {args.output}")
+
+
+def import_command(args):
+    """Merges session logs from other machines into this profile's log"""
+    store = open_session_store(args.log_dir)
+    if not hasattr(store, 'rotate'):
+        print("Logs can only be imported into the CSV log.")
+        return
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        print(f"Error: {', '.join(missing)} not found!")
+        return
+    from log_merge import import_logs
+    stats = import_logs(store, args.inputs, args.chunk_rows, not args.keep_overlaps)
+    print_merge_stats(stats, len(args.inputs) + 1)
+
+
+def dashboard_command(args):
+    """Prints totals per profile and combined, reading the shards in parallel"""
+    profiles = list_profiles(args.log_root)
+    aggregates = load_profile_aggregates(args.log_root, profiles, workers=args.workers)
+    combined = merge_aggregates(aggregates.values())
+    if combined.count == 0:
+        print("No session logs found.")
+        return
+
+    print(f"{'Profile':<20} {'Sessions':>9} {'Hours':>9} {'Avg (sec)':>10}")
+    for profile, aggregate in list(aggregates.items()) + [("All profiles", combined)]:
+        if aggregate.count:
+            print(f"{profile:<20} {aggregate.count:>9} {aggregate.total / 3600:>9.1f} "
+                  f"{aggregate.total / aggregate.count:>10.0f}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m practice_core", description="Guitar Practice without a GUI")
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR, help="session log directory")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, help="whose log to use (created if new)")
+    parser.add_argument('--perf-profile', action='store_true',
+                        help="time hot paths; writes perf_metrics.prom/.json to the log directory")
+    parser.add_argument('--cprofile', action='store_true', help="also write cProfile stats to perf.pstats (implies --perf-profile)")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="also record memory use and top allocations (implies --perf-profile)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def session_options(command):
+        command.add_argument('file', help="practice file (CSV)")
+        command.add_argument('--interval', type=float, help="global interval in seconds")
+        command.add_argument('--mode', choices=ChordSampler.MODES, help="chord selection mode")
+
+    run = commands.add_parser('run', help="practice in the terminal")
+    session_options(run)
+    run.add_argument('--minutes', type=float, help="stop after this many minutes")
+    run.add_argument('--speed', type=float, default=1.0, help="clock speed multiplier")
+    run.add_argument('--event-fsync', choices=FSYNC_POLICIES, default='interval',
+                     help="when the chord event log is fsynced")
+    run.add_argument('--audio', choices=('off', 'clicks', 'chords', 'both'), default='off',
+                     help="play a click per countdown tick and/or a tone per chord (needs numpy)")
+    run.add_argument('--audio-wav', help="write the audio cues to this WAV file instead of the speakers")
+    run.set_defaults(handler=run_command)
+
+    simulate = commands.add_parser('simulate', help="simulate sessions on a virtual clock")
+    session_options(simulate)
+    simulate.add_argument('--sessions', type=int, default=10)
+    simulate.add_argument('--length', type=float, default=600, help="session length in seconds")
+    simulate.add_argument('--gap', type=float, default=3600, help="seconds between sessions")
+    simulate.add_argument('--skip-rate', type=float, default=0.0, help="chance of pressing Next on a chord")
+    simulate.add_argument('--speed', type=float, default=None, help="clock speed multiplier (default: instant)")
+    simulate.add_argument('--seed', type=int)
+    simulate.add_argument('--top', type=int, default=20, help="chords to list")
+    simulate.add_argument('--log', action='store_true', help="write simulated sessions to the session log")
+    simulate.set_defaults(handler=simulate_command)
+
+    replay = commands.add_parser('replay', help="re-run logged sessions at accelerated speed")
+    session_options(replay)
+    replay.add_argument('--last', type=int, default=10, help="number of most recent sessions")
+    replay.add_argument('--speed', type=float, default=None, help="clock speed multiplier (default: instant)")
+    replay.add_argument('--show', type=int, default=12, help="chords to print per session")
+    replay.set_defaults(handler=replay_command)
+
+    stats = commands.add_parser('stats', help="print session analytics")
+    stats.add_argument('--days', type=int, default=7, help="recent days to list")
+    stats.set_defaults(handler=stats_command)
+
+    def merge_options(command):
+        command.add_argument('inputs', nargs='+', help="session logs or log directories")
+        command.add_argument('--keep-overlaps', action='store_true',
+                             help="only drop identical sessions, not overlapping ones")
+        command.add_argument('--chunk-rows', type=int,
+                             help="sessions per sorted run when an input is out of order (default: 500000)")
+
+    merge = commands.add_parser('merge', help="merge session logs from several machines into one")
+    merge.add_argument('output', help="merged CSV log to write")
+    merge_options(merge)
+    merge.set_defaults(handler=merge_command)
+
+    import_ = commands.add_parser('import', help="merge session logs from other machines into this log")
+    merge_options(import_)
+    import_.set_defaults(handler=import_command)
+
+    compact = commands.add_parser('compact', help="seal finished months of the log into compressed segments")
+    compact.set_defaults(handler=compact_command)
+
+    dashboard = commands.add_parser('dashboard', help="totals for every profile and combined")
+    dashboard.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    dashboard.set_defaults(handler=dashboard_command)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.log_root = args.log_dir
+    try:
+        args.log_dir = profile_dir(args.log_root, args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command not in ('stats', 'compact', 'dashboard', 'merge', 'import') and not os.path.exists(args.file):
+        print(f"Error: {args.file} not found!")
+        return 1
+    if args.command in ('run', 'replay', 'stats', 'import') or getattr(args, 'log', False):
+        os.makedirs(args.log_dir, exist_ok=True)
+    if args.perf_profile or args.cprofile or args.tracemalloc:
+        perf_metrics.enable(cprofile=args.cprofile, trace_memory=args.tracemalloc)
+    try:
+        args.handler(args)
+    finally:
+        if perf_metrics.registry is not None:
+            os.makedirs(args.log_dir, exist_ok=True)
+            perf_metrics.write(args.log_dir, final=True)
+            perf_metrics.disable()
+            print(f"Performance metrics written to {args.log_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,463 @@
+import bisect
+import csv
+import itertools
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+
+# Compiled cache layout, little-endian:
+#   header: magic, CSV size, CSV mtime (ns), chord count, name blob length
+#   intervals: count doubles (NaN = use the global interval)
+#   weights: count doubles
+#   name offsets: count + 1 uint32 into the blob
+#   name blob: UTF-8
+CACHE_MAGIC = b'GPC1'
+CACHE_HEADER = struct.Struct('<4sQqII')
+CACHE_SUFFIX = '.compiled'
+INDEX_FILENAME = '.practice_index.json'
+# Columns of a practice spec that are not dimensions
+SPEC_COLUMNS = ('Duration', 'Weight', 'Format')
+SPEC_SEPARATOR = '|'
+
+
+def parse_weight(value):
+    """Weight column value; missing or malformed weights count as 1"""
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        return 1.0
+    return weight if weight >= 0 else 1.0
+
+
+def parse_duration(value):
+    """Duration column value in seconds; NaN when missing or malformed"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class PracticeFile:
+    """A practice file compiled into parallel arrays.
+
+    notes holds interned chord names; intervals and weights are array('d')
+    with one entry per note. A repeated chord keeps its first position and
+    its last row's values, as the original dict-based loader did.
+    """
+
+    def __init__(self, notes, intervals, weights):
+        self.notes = notes
+        self.intervals = intervals
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.notes)
+
+    @classmethod
+    def parse(cls, path):
+        with open(path, 'r', newline='') as file:
+            return cls.from_reader(csv.DictReader(file))
+
+    @classmethod
+    def from_reader(cls, reader):
+        positions = {}
+        notes = []
+        intervals = array('d')
+        weights = array('d')
+        for row in reader:
+            note = sys.intern(row['Type'])
+            interval = parse_duration(row.get('Duration'))
+            weight = parse_weight(row.get('Weight'))
+            if note in positions:
+                intervals[positions[note]] = interval
+                weights[positions[note]] = weight
+            else:
+                positions[note] = len(notes)
+                notes.append(note)
+                intervals.append(interval)
+                weights.append(weight)
+        return cls(notes, intervals, weights)
+
+    def interval_map(self):
+        """Chord name -> interval in seconds, or None to use the global interval"""
+        return {
+            note: None if math.isnan(interval) else interval
+            for note, interval in zip(self.notes, self.intervals)
+        }
+
+    def total_duration(self):
+        return sum(i for i in self.intervals if not math.isnan(i))
+
+    def save_cache(self, cache_path, stat):
+        blob = bytearray()
+        offsets = array('I', [0])
+        for note in self.notes:
+            blob += note.encode('utf-8')
+            offsets.append(len(blob))
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(CACHE_HEADER.pack(
+                CACHE_MAGIC, stat.st_size, stat.st_mtime_ns, len(self.notes), len(blob)
+            ))
+            for values in (self.intervals, self.weights):
+                if sys.byteorder != 'little':
+                    values = array('d', values)
+                    values.byteswap()
+                values.tofile(file)
+            offsets.tofile(file)
+            file.write(blob)
+        os.replace(tmp_path, cache_path)
+
+    @classmethod
+    def load_cache(cls, cache_path, stat):
+        """Memory-maps a compiled cache; None if missing or not for this CSV"""
+        try:
+            with open(cache_path, 'rb') as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as buffer:
+                        return cls._from_buffer(buffer, stat)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @classmethod
+    def _from_buffer(cls, buffer, stat):
+        magic, size, mtime_ns, count, blob_len = CACHE_HEADER.unpack_from(buffer)
+        if magic != CACHE_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+
+        pos = CACHE_HEADER.size
+        intervals = array('d')
+        intervals.frombytes(buffer[pos:pos + 8 * count])
+        pos += 8 * count
+        weights = array('d')
+        weights.frombytes(buffer[pos:pos + 8 * count])
+        pos += 8 * count
+        offsets = array('I')
+        offsets.frombytes(buffer[pos:pos + 4 * (count + 1)])
+        pos += 4 * (count + 1)
+        blob = bytes(buffer[pos:pos + blob_len])
+        if sys.byteorder != 'little':
+            for values in (intervals, weights, offsets):
+                values.byteswap()
+        if len(blob) != blob_len or len(offsets) != count + 1:
+            return None
+
+        notes = [
+            sys.intern(blob[offsets[i]:offsets[i + 1]].decode('utf-8'))
+            for i in range(count)
+        ]
+        return cls(notes, intervals, weights)
+
+
+class ExerciseGroup:
+    """One row of a practice spec: every combination of its dimensions'
+    values, in itertools.product order (the last dimension varies fastest)"""
+
+    def __init__(self, dimensions, values, template, interval, weight):
+        self.dimensions = dimensions
+        self.values = values
+        self.template = template
+        self.interval = interval
+        self.weight = weight
+        self.size = math.prod(len(options) for options in values)
+
+    def __eq__(self, other):
+        return isinstance(other, ExerciseGroup) and self.key() == other.key()
+
+    def key(self):
+        return (self.dimensions, self.values, self.template, self.interval, self.weight)
+
+    def format(self, values):
+        if self.template is None:
+            return ' '.join(value for value in values if value)
+        return self.template.format_map(dict(zip(self.dimensions, values)))
+
+    def name(self, index):
+        """Name of the index-th combination, decoded as a mixed-radix number"""
+        values = []
+        for options in reversed(self.values):
+            index, digit = divmod(index, len(options))
+            values.append(options[digit])
+        values.reverse()
+        return self.format(values)
+
+    def names(self):
+        for values in itertools.product(*self.values):
+            yield self.format(values)
+
+
+class ExerciseSpace:
+    """The chord names of a practice spec, expanded on demand.
+
+    Behaves like a read-only list of names: group g covers indexes
+    offsets[g] to offsets[g + 1], and an index is turned into its name by
+    arithmetic alone. Nothing is materialized, so a million-combination
+    space costs no more memory than its spec. Iterating yields names lazily.
+    """
+
+    # Names handed out by index are remembered (LRU) so the session can look
+    # up a drawn chord's interval by name
+    RECENT_NAMES = 4096
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.offsets = [0]
+        for group in groups:
+            self.offsets.append(self.offsets[-1] + group.size)
+        self.recent = OrderedDict()
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        g = bisect.bisect_right(self.offsets, index) - 1
+        group = self.groups[g]
+        name = group.name(index - self.offsets[g])
+        self.recent[name] = group
+        self.recent.move_to_end(name)
+        if len(self.recent) > self.RECENT_NAMES:
+            self.recent.popitem(last=False)
+        return name
+
+    def __iter__(self):
+        for group in self.groups:
+            yield from group.names()
+
+    @property
+    def runs(self):
+        """(count, weight) per group, for weighted draws by index"""
+        return [(group.size, group.weight) for group in self.groups]
+
+    def interval_of(self, name):
+        """Interval of a recently handed out name; None if unknown or unset"""
+        group = self.recent.get(name)
+        if group is None:
+            return None
+        self.recent.move_to_end(name)
+        return group.interval
+
+
+class SpecIntervals:
+    """interval_map() of a PracticeSpec, without a dict of every name"""
+
+    def __init__(self, space):
+        self.space = space
+
+    def get(self, note, default=None):
+        interval = self.space.interval_of(note)
+        return default if interval is None else interval
+
+
+class PracticeSpec:
+    """A compact practice file that describes chords instead of listing them.
+
+    A CSV without a Type column is a spec. Every column other than
+    Duration, Weight and Format is a dimension, and each row is a group
+    whose chords are all combinations of its dimensions' values, listed in
+    the cell separated by '|' (an empty entry is allowed, e.g. '|m|7' for
+    major, minor and 7th). Duration and Weight apply to each chord of the
+    group. Format names them (e.g. '{Root}{Quality} ({Position})'); by
+    default the non-empty values are joined with spaces:
+
+        Root,Quality,Position,Duration
+        C|C#|D|Eb|E|F|F#|G|Ab|A|Bb|B,|m|7|maj7|m7,open|barre,10
+
+    notes is an ExerciseSpace, so the combinations are never materialized;
+    unlike a plain practice file, names repeated across groups are kept.
+    """
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.notes = ExerciseSpace(groups)
+        self.weights = None
+
+    def __len__(self):
+        return len(self.notes)
+
+    @classmethod
+    def from_reader(cls, reader):
+        dimensions = tuple(name for name in reader.fieldnames if name not in SPEC_COLUMNS)
+        if not dimensions:
+            raise ValueError("A practice file needs a Type column or spec dimensions")
+        groups = []
+        for row in reader:
+            cells = [row.get(dimension) or '' for dimension in dimensions]
+            if not any(cell.strip() for cell in cells):
+                continue
+            values = tuple(
+                tuple(value.strip() for value in cell.split(SPEC_SEPARATOR))
+                for cell in cells
+            )
+            interval = parse_duration(row.get('Duration'))
+            group = ExerciseGroup(
+                dimensions,
+                values,
+                row.get('Format') or None,
+                None if math.isnan(interval) else interval,
+                parse_weight(row.get('Weight'))
+            )
+            try:
+                group.name(0)  # Raises here, at load time, for a bad Format
+            except (KeyError, IndexError, AttributeError, TypeError, ValueError) as e:
+                raise ValueError(f"bad Format {group.template!r}: {e!r}") from e
+            groups.append(group)
+        return cls(groups)
+
+    def interval_map(self):
+        return SpecIntervals(self.notes)
+
+    def total_duration(self):
+        return sum(group.size * group.interval for group in self.groups if group.interval is not None)
+
+
+def parse_practice_file(path):
+    """A PracticeFile, or a PracticeSpec for a CSV without a Type column"""
+    with open(path, 'r', newline='') as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames and 'Type' not in reader.fieldnames:
+            return PracticeSpec.from_reader(reader)
+        return PracticeFile.from_reader(reader)
+
+
+def diff_practice_files(old, new):
+    """Returns (added, removed, changed) chord names between two loads"""
+    if isinstance(old, PracticeSpec) or isinstance(new, PracticeSpec):
+        # Specs are compared by their groups rather than expanded; each
+        # group that changed or went away is reported by its first chord
+        old_groups = old.groups if isinstance(old, PracticeSpec) else []
+        new_groups = new.groups if isinstance(new, PracticeSpec) else []
+        changed = [
+            group.name(0) for i, group in enumerate(new_groups)
+            if i >= len(old_groups) or old_groups[i] != group
+        ]
+        removed = [group.name(0) for group in old_groups[len(new_groups):]]
+        return [], removed, changed
+    old_rows = {note: (old.intervals[i], old.weights[i]) for i, note in enumerate(old.notes)}
+    new_rows = {note: (new.intervals[i], new.weights[i]) for i, note in enumerate(new.notes)}
+    added = [note for note in new.notes if note not in old_rows]
+    removed = [note for note in old.notes if note not in new_rows]
+    # NaN != NaN, so compare the raw bytes of the values
+    changed = [
+        note for note in new.notes
+        if note in old_rows and struct.pack('dd', *old_rows[note]) != struct.pack('dd', *new_rows[note])
+    ]
+    return added, removed, changed
+
+
+def load_practice_file(path):
+    """Loads a practice file, reusing its compiled cache when still current.
+
+    The cache sits next to the CSV and is keyed by the CSV's size and
+    mtime, so any edit causes a re-parse and a fresh cache.
+    """
+    stat = os.stat(path)
+    cache_path = path + CACHE_SUFFIX
+    practice = PracticeFile.load_cache(cache_path, stat)
+    if practice is None:
+        practice = parse_practice_file(path)
+        if isinstance(practice, PracticeSpec):
+            return practice  # A spec is only a few rows; nothing to cache
+        try:
+            practice.save_cache(cache_path, stat)
+        except OSError:
+            pass  # Read-only location; the parsed file is still usable
+    return practice
+
+
+class PracticeIndex:
+    """Persisted metadata for every practice file in a directory.
+
+    Each entry records the file's mtime and size plus its chord count and
+    total practice duration. refresh() re-reads only files whose mtime or
+    size changed, so reopening a large library costs one directory scan.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILENAME)
+        self.entries = {}
+        self.names = []
+        self.lower_names = []
+        try:
+            with open(self.path, 'r') as file:
+                self.entries = {name: tuple(entry) for name, entry in json.load(file).items()}
+        except (OSError, ValueError, TypeError):
+            self.entries = {}
+
+    def refresh(self):
+        entries = {}
+        changed = False
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith('.csv') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                cached = self.entries.get(entry.name)
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    entries[entry.name] = cached
+                    continue
+                try:
+                    practice = parse_practice_file(entry.path)
+                    entries[entry.name] = (stat.st_mtime_ns, stat.st_size, len(practice), practice.total_duration())
+                except (OSError, ValueError, KeyError, csv.Error):
+                    entries[entry.name] = (stat.st_mtime_ns, stat.st_size, 0, 0.0)
+                changed = True
+
+        if changed or entries.keys() != self.entries.keys():
+            self.entries = entries
+            self.save()
+        self.names = sorted(self.entries, key=str.lower)
+        self.lower_names = [name.lower() for name in self.names]
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(self.entries, file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Read-only library; the index is rebuilt next time
+
+    def remove(self, name):
+        if name in self.entries:
+            del self.entries[name]
+            i = self.names.index(name)
+            del self.names[i]
+            del self.lower_names[i]
+            self.save()
+
+    def info(self, name):
+        """Returns (chord count, total duration in seconds) for a file"""
+        entry = self.entries[name]
+        return entry[2], entry[3]
+
+    def search(self, query):
+        """Names matching a case-insensitive query: prefix matches first
+        (found by binary search), then the remaining substring matches"""
+        query = query.lower()
+        if not query:
+            return list(self.names)
+        lo = bisect.bisect_left(self.lower_names, query)
+        hi = lo
+        while hi < len(self.lower_names) and self.lower_names[hi].startswith(query):
+            hi += 1
+        prefix = self.names[lo:hi]
+        rest = [
+            name for i, (name, lower) in enumerate(zip(self.names, self.lower_names))
+            if query in lower and not lo <= i < hi
+        ]
+        return prefix + rest
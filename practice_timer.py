@@ -0,0 +1,109 @@
+import time
+
+import perf_metrics
+
+
+class PracticeTimer:
+    """Chord-change and countdown scheduler driven by absolute deadlines.
+
+    Every tick is scheduled against a target on the monotonic clock rather
+    than as a relative sleep, so time spent updating widgets never
+    accumulates into drift. Scheduling goes through an after()-style pair of
+    callables (Tk's root.after/after_cancel in the app), so all callbacks run
+    on the thread that owns the widgets.
+
+    on_chord() shows the next chord and returns its interval in seconds;
+    on_tick(remaining) is called once per tick with the seconds left, as
+    scheduled, before the next chord.
+
+    An optional observer(kind, scheduled, started, finished) is told, for
+    every scheduled "chord" change and "tick", when it was due, when its
+    callback started and when the widget update returned.
+    """
+
+    TICK = 1.0
+    MIN_INTERVAL = 0.1
+    # Past this lateness a chord change restarts from "now" instead of
+    # trying to catch up with the schedule (e.g. after the machine slept)
+    MAX_LATENESS = 1.0
+
+    def __init__(self, schedule, cancel, on_chord, on_tick, clock=time.monotonic):
+        self.schedule = schedule
+        self.cancel = cancel
+        self.on_chord = on_chord
+        self.on_tick = on_tick
+        self.clock = clock
+        self.observer = None
+        self.running = False
+        self.job = None
+        self.interval = 0
+        self.chord_start = 0
+        self.deadline = 0
+        self.tick_count = 0
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._begin_chord(self.clock())
+
+    def stop(self, cancel_pending=True):
+        """Stops the timer. Pass cancel_pending=False when the scheduler is
+        already gone (e.g. Tk destroyed) and the pending callback cannot run."""
+        self.running = False
+        if cancel_pending:
+            self._cancel_job()
+        self.job = None
+
+    def force_next(self):
+        """Moves on to the next chord immediately"""
+        if self.running:
+            self._cancel_job()
+            self._begin_chord(self.clock())
+
+    def _cancel_job(self):
+        if self.job is not None:
+            self.cancel(self.job)
+            self.job = None
+
+    def _schedule_at(self, target):
+        delay_ms = max(0, int(round((target - self.clock()) * 1000)))
+        self.job = self.schedule(delay_ms, self._on_timer)
+
+    def _begin_chord(self, start):
+        self.interval = max(self.MIN_INTERVAL, float(self.on_chord()))
+        self.chord_start = start
+        self.deadline = start + self.interval
+        self.tick_count = 0
+        self._tick()
+
+    def _tick(self):
+        remaining = round(self.interval - self.tick_count * self.TICK, 3)
+        self.on_tick(remaining)
+
+        # Skip ticks that are already in the past rather than bunching them up
+        now = self.clock()
+        self.tick_count += 1
+        while self.chord_start + self.tick_count * self.TICK <= now:
+            self.tick_count += 1
+        self._schedule_at(min(self.chord_start + self.tick_count * self.TICK, self.deadline))
+
+    @perf_metrics.timed('timer_tick')
+    def _on_timer(self):
+        self.job = None
+        if not self.running:
+            return
+        now = self.clock()
+        if now >= self.deadline:
+            scheduled = self.deadline
+            late = now - self.deadline
+            self._begin_chord(self.deadline if late < self.MAX_LATENESS else now)
+            if self.observer:
+                self.observer("chord", scheduled, now, self.clock())
+        elif self.chord_start + self.tick_count * self.TICK <= now:
+            scheduled = self.chord_start + self.tick_count * self.TICK
+            self._tick()
+            if self.observer:
+                self.observer("tick", scheduled, now, self.clock())
+        else:
+            # Woke up early; wait for the scheduled target
+            self._schedule_at(min(self.chord_start + self.tick_count * self.TICK, self.deadline))
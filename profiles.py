@@ -0,0 +1,93 @@
+"""Per-profile session log shards.
+
+The default profile keeps using the log directory itself, so existing logs
+carry on unchanged. Every other profile is a shard in
+<log dir>/profiles/<name>/ with its own session log, journal and chord
+event log.
+
+The combined view never moves raw rows between processes: each shard is
+reduced to a SessionAggregate in a worker process (cheap when the CSV
+sidecar is current, a parallel scan when it is not) and the partial
+aggregates are merged.
+"""
+import os
+
+from session_store import SessionAggregate, open_session_store
+
+PROFILES_DIR = "profiles"
+DEFAULT_PROFILE = "default"
+
+
+def is_valid_name(name):
+    """Profile names become directory names, so no separators or dot names"""
+    return (
+        bool(name) and name == name.strip() and name not in ('.', '..')
+        and not any(char in name for char in '/\\:*?"<>|')
+    )
+
+
+def profile_dir(log_dir, profile):
+    if profile == DEFAULT_PROFILE:
+        return log_dir
+    if not is_valid_name(profile):
+        raise ValueError(f"Invalid profile name: {profile!r}")
+    return os.path.join(log_dir, PROFILES_DIR, profile)
+
+
+def list_profiles(log_dir):
+    """The default profile followed by every named profile, sorted"""
+    try:
+        names = sorted(
+            entry.name for entry in os.scandir(os.path.join(log_dir, PROFILES_DIR))
+            if entry.is_dir() and is_valid_name(entry.name) and entry.name != DEFAULT_PROFILE
+        )
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_PROFILE] + names
+
+
+def create_profile(log_dir, profile):
+    path = profile_dir(log_dir, profile)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def shard_aggregate(shard_dir, backend=None):
+    """Totals for one profile's log; runs in a worker process"""
+    store = open_session_store(shard_dir, backend)
+    try:
+        return store.aggregate()
+    finally:
+        store.close()
+
+
+def submit_shards(executor, log_dir, profiles=None, backend=None):
+    """Starts one shard_aggregate per profile; returns {future: profile}"""
+    return {
+        executor.submit(shard_aggregate, profile_dir(log_dir, profile), backend): profile
+        for profile in (profiles or list_profiles(log_dir))
+    }
+
+
+def merge_aggregates(aggregates):
+    combined = SessionAggregate()
+    for aggregate in aggregates:
+        combined.merge(aggregate)
+    return combined
+
+
+def load_profile_aggregates(log_dir, profiles=None, backend=None, workers=None):
+    """{profile: SessionAggregate} for every profile, loaded in parallel"""
+    profiles = profiles or list_profiles(log_dir)
+    if len(profiles) == 1 or workers == 1:
+        # A pool costs more to start than a single shard takes to read
+        return {profile: shard_aggregate(profile_dir(log_dir, profile), backend) for profile in profiles}
+
+    # Imported here: the process pool pulls in multiprocessing, which the
+    # app shouldn't pay for at startup
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    workers = min(len(profiles), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = submit_shards(executor, log_dir, profiles, backend)
+        results = {futures[future]: future.result() for future in as_completed(futures)}
+    return {profile: results[profile] for profile in profiles}
@@ -0,0 +1,122 @@
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+
+from session_store import TIME_FORMAT
+
+# Fixed-size record: magic, kind, session start and record time as epoch
+# seconds, CRC32 of everything before it. 32 bytes, so a checkpoint is a
+# single small append and a torn write can only damage the last record.
+RECORD = struct.Struct('<2sB5xddI4x')
+MAGIC = b'GJ'
+BEGIN, CHECKPOINT = 1, 2
+
+
+def sync(fd):
+    if hasattr(os, 'fdatasync'):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+class SessionJournal:
+    """Write-ahead journal for the session in progress.
+
+    begin() starts a new journal, checkpoint() appends one fixed-size record
+    (no rewrite), and end() clears the journal once the session has reached
+    the main log. A journal left behind by a crash or kill holds an orphaned
+    session, which recover() writes to the log ending at its last checkpoint.
+
+    Every record reaches the OS at once, which is enough to survive the app
+    crashing or being killed. When durable, begin() and end() are also
+    flushed to disk, but checkpoints only every sync_interval seconds: they
+    are written on the UI thread, and a power loss then costs at most that
+    much more of the session.
+    """
+
+    def __init__(self, path, durable=True, sync_interval=10.0, clock=time.monotonic):
+        self.path = path
+        self.durable = durable
+        self.sync_interval = sync_interval
+        self.clock = clock
+        self.synced = None
+        self.fd = None
+
+    def _append(self, kind, start, when):
+        record = RECORD.pack(MAGIC, kind, start, when, 0)
+        record = record[:-8] + struct.pack('<I4x', zlib.crc32(record[:-8]))
+        os.write(self.fd, record)
+        if self.durable:
+            now = self.clock()
+            if kind != CHECKPOINT or self.synced is None or now - self.synced >= self.sync_interval:
+                sync(self.fd)
+                self.synced = now
+
+    def begin(self, start_time):
+        self.close()
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        self.start = start_time.timestamp()
+        self.synced = None
+        self._append(BEGIN, self.start, self.start)
+
+    def checkpoint(self, when):
+        if self.fd is not None:
+            self._append(CHECKPOINT, self.start, when.timestamp())
+
+    def end(self):
+        """Marks the session as safely logged and empties the journal"""
+        if self.fd is not None:
+            os.ftruncate(self.fd, 0)
+            if self.durable:
+                sync(self.fd)
+            self.close()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def read(self):
+        """Returns (start, last checkpoint) epoch seconds for the journalled
+        session, or None if there is none. Damaged or partial records at
+        the end are ignored."""
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        session = None
+        for pos in range(0, len(data) - RECORD.size + 1, RECORD.size):
+            record = data[pos:pos + RECORD.size]
+            magic, kind, start, when, crc = RECORD.unpack(record)
+            if magic != MAGIC or crc != zlib.crc32(record[:-8]):
+                break
+            if kind == BEGIN:
+                session = [start, when]
+            elif session and kind == CHECKPOINT and start == session[0]:
+                session[1] = when
+        return tuple(session) if session else None
+
+    def recover(self, session_store):
+        """Logs an orphaned session from a previous run, then clears the
+        journal. Returns the recovered (start, end, duration) or None."""
+        session = self.read()
+        if session is None:
+            return None
+
+        start, last_checkpoint = session
+        recovered = None
+        start_text = datetime.fromtimestamp(start).strftime(TIME_FORMAT)
+        end_text = datetime.fromtimestamp(last_checkpoint).strftime(TIME_FORMAT)
+        duration = int(last_checkpoint - start)
+        # The session may have reached the log just before the crash
+        if duration > 0 and session_store.count_in_range(start_text, start_text) == 0:
+            session_store.append(start_text, end_text, duration)
+            recovered = (start_text, end_text, duration)
+
+        with open(self.path, 'wb'):
+            pass
+        return recovered
@@ -0,0 +1,168 @@
+from array import array
+from datetime import date, datetime, timedelta
+
+from session_store import TIME_FORMAT
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+# Stored for timestamps that don't parse; sorts before every real time
+INVALID_TIME = -2 ** 63
+
+
+class TimestampParser:
+    """Fixed-format TIME_FORMAT parser returning naive local epoch seconds.
+
+    Seconds count from 1970-01-01 00:00 in the log's own (local) time, so
+    no timezone conversion happens and the values sort like the strings.
+    Dates and hour:minute pairs repeat across sessions, so both are parsed
+    once and cached; a call is then two dict lookups and one int(). Returns
+    None when the text is not exactly 'YYYY-MM-DD HH:MM:SS'.
+    """
+
+    def __init__(self):
+        self.days = {}
+        self.minutes = {}
+
+    @staticmethod
+    def parse_day(text):
+        try:
+            return (date.fromisoformat(text).toordinal() - EPOCH_ORDINAL) * 86400
+        except ValueError:
+            return False
+
+    @staticmethod
+    def parse_minute(text):
+        if text[2] != ':' or not text[:2].isdigit() or not text[3:].isdigit():
+            return False
+        hour, minute = int(text[:2]), int(text[3:])
+        return hour * 3600 + minute * 60 if hour < 24 and minute < 60 else False
+
+    def __call__(self, text):
+        if len(text) != 19 or text[10] != ' ' or text[16] != ':':
+            return None
+        day = self.days.get(text[:10])
+        if day is None:
+            day = self.days[text[:10]] = self.parse_day(text[:10])
+        minute = self.minutes.get(text[11:16])
+        if minute is None:
+            minute = self.minutes[text[11:16]] = self.parse_minute(text[11:16])
+        second = text[17:]
+        if day is False or minute is False or not second.isdigit() or second > '59':
+            return None
+        return day + minute + int(second)
+
+
+def format_timestamp(seconds):
+    return (EPOCH + timedelta(seconds=seconds)).strftime(TIME_FORMAT)
+
+
+class SessionRecord:
+    """Read-only view of one session in a SessionModel"""
+
+    __slots__ = ('model', 'index')
+
+    def __init__(self, model, index):
+        self.model = model
+        self.index = index
+
+    @property
+    def start(self):
+        return self.model.starts[self.index]
+
+    @property
+    def end(self):
+        return self.model.ends[self.index]
+
+    @property
+    def duration(self):
+        return self.model.durations[self.index]
+
+    def values(self):
+        """(start, end, duration) as shown in the session table"""
+        return self.model.display(self.index)
+
+
+class SessionModel:
+    """Sessions as typed columns plus cached sort orders, held outside Tk.
+
+    Start and End are kept as int64 epoch seconds (array('q')) and Duration
+    as int32 (array('i')), about 20 bytes a session instead of a tuple of
+    strings plus parsed datetimes. Display strings are only formatted for
+    the rows in the visible window. A sort permutation per column is built
+    on the integer keys the first time that column is sorted and reused
+    until rows change; descending order reads the same permutation from
+    the back, so toggling direction costs nothing.
+    """
+
+    COLUMNS = ("Start", "End", "Duration")
+
+    def __init__(self, rows=()):
+        self.replace(rows)
+
+    def replace(self, rows):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.durations = array('i')
+        self.columns = {"Start": self.starts, "End": self.ends, "Duration": self.durations}
+        # Logged text of timestamps that didn't parse, by row, so they still
+        # show up as written
+        self.raw = {}
+        self.orders = {}
+        self.extend(rows)
+
+    def extend(self, rows):
+        # A fresh parser per batch, so its caches don't outlive the load
+        parse = TimestampParser()
+        base = len(self.starts)
+        added = False
+        for index, (start, end, duration) in enumerate(rows, start=base):
+            start_seconds = parse(start)
+            end_seconds = parse(end)
+            if start_seconds is None or end_seconds is None:
+                self.raw[index] = (start, end)
+            self.starts.append(INVALID_TIME if start_seconds is None else start_seconds)
+            self.ends.append(INVALID_TIME if end_seconds is None else end_seconds)
+            self.durations.append(duration)
+            added = True
+        if added:
+            self.orders = {}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self.starts):
+            raise IndexError(index)
+        return SessionRecord(self, index)
+
+    def display(self, index):
+        """(start, end, duration) of a row, with times formatted as logged"""
+        if index in self.raw:
+            start, end = self.raw[index]
+        else:
+            start, end = format_timestamp(self.starts[index]), format_timestamp(self.ends[index])
+        return start, end, self.durations[index]
+
+    def order(self, col):
+        """Ascending permutation of row indexes for a column"""
+        if col not in self.orders:
+            # Sorting through a list avoids boxing an int per key lookup
+            key = self.columns[col].tolist()
+            self.orders[col] = array('i', sorted(range(len(key)), key=key.__getitem__))
+        return self.orders[col]
+
+    def row_index(self, position, col, reverse):
+        """Row index shown at a position of the view sorted by col"""
+        order = self.order(col)
+        return order[len(order) - 1 - position] if reverse else order[position]
+
+    def window(self, offset, count, col, reverse):
+        """Rows for view positions [offset, offset + count) in sorted order"""
+        order = self.order(col)
+        n = len(order)
+        end = min(n, offset + count)
+        if reverse:
+            indexes = order[n - end:n - offset][::-1]
+        else:
+            indexes = order[offset:end]
+        return [self.display(i) for i in indexes]
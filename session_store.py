@@ -0,0 +1,737 @@
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import struct
+import tempfile
+from collections import defaultdict
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+CSV_HEADER = ["Session Start", "Session End", "Duration (seconds)"]
+
+# Backend used by open_session_store when none is given explicitly
+BACKEND_ENV_VAR = 'GUITAR_PRACTICE_LOG_BACKEND'
+DEFAULT_BACKEND = 'csv'
+
+# Sealed monthly segments of a CSV log: the month's rows as gzip-compressed
+# CSV, followed by a fixed-size footer with the month's totals, so totals
+# and range checks never need to decompress a sealed month
+SEGMENT_DIR = 'segments'
+SEGMENT_SUFFIX = '.seg'
+SEGMENT_MAGIC = b'GSEG'
+# magic, count, total, min, max, sum of squares (durations), first and last
+# session start (TIME_FORMAT), length of the gzip data before the footer
+SEGMENT_FOOTER = struct.Struct('<4sqqqqq19s19sQ')
+# Sessions per chunk handed out by changes_since
+CHANGES_CHUNK = 50000
+
+
+def chunked(rows, size):
+    """Yields lists of up to size consecutive rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_csv_rows(csv_reader):
+    """Yields (start, end, duration) for every well-formed session row"""
+    for row in csv_reader:
+        if len(row) == 3:
+            try:
+                yield row[0], row[1], int(row[2])
+            except ValueError:
+                pass
+
+
+class CSVTail:
+    """Iterates the sessions in a CSV log from a byte offset onwards.
+
+    Only complete lines are consumed; after iteration self.offset is the
+    byte position just past the last complete line, ready for the next read.
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+
+    def _lines(self, file):
+        for line in file:
+            if not line.endswith(b'\n'):
+                break  # Partially written row; pick it up next time
+            start = self.offset
+            self.offset += len(line)
+            if start == 0 and line.startswith(b'Session Start'):
+                continue
+            yield line.decode('utf-8')
+
+    def __iter__(self):
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            yield from parse_csv_rows(csv.reader(self._lines(file)))
+
+
+class SessionAggregate:
+    """Running totals over session durations, persisted next to a CSV log.
+
+    offset is the size of the log the totals cover, and inode and mtime
+    (nanoseconds) identify the log as it was then, so a reader can tell
+    whether the sidecar is current, only needs the appended tail folded in,
+    or has to be rebuilt.
+    """
+
+    FIELDS = ('count', 'total', 'min', 'max', 'sum_sq', 'offset', 'inode', 'mtime')
+
+    def __init__(self, count=0, total=0, min=None, max=None, sum_sq=0, offset=0, inode=None, mtime=None):
+        self.count = count
+        self.total = total
+        self.min = min
+        self.max = max
+        self.sum_sq = sum_sq
+        self.offset = offset
+        self.inode = inode
+        self.mtime = mtime
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.sum_sq += duration * duration
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+
+    def merge(self, other):
+        """Folds in the totals of another log (offset is left alone)"""
+        self.count += other.count
+        self.total += other.total
+        self.sum_sq += other.sum_sq
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def catch_up(self, log_path):
+        """Folds in every session appended to the log since self.offset"""
+        tail = CSVTail(log_path, self.offset)
+        for _, _, duration in tail:
+            self.add(duration)
+        self.offset = tail.offset
+        stat = os.stat(log_path)
+        self.inode = stat.st_ino
+        self.mtime = stat.st_mtime_ns
+
+    def matches(self, stat):
+        """True if the totals were taken from the log file described by stat.
+
+        The same inode with the size unchanged but a different mtime means the
+        log was rewritten in place; a different inode means it was replaced.
+        """
+        if self.inode != stat.st_ino:
+            return False
+        return stat.st_size != self.offset or stat.st_mtime_ns == self.mtime
+
+    @classmethod
+    def load(cls, path):
+        """Returns the stored aggregate, or None if it is missing or corrupt"""
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+            aggregate = cls(**{field: data[field] for field in cls.FIELDS})
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if aggregate.count < 0 or aggregate.offset < 0:
+            return None
+        return aggregate
+
+    def save(self, path):
+        """Atomically replaces the sidecar file.
+
+        The loader thread, the UI thread and dashboard worker processes may
+        all save at once, so each write goes through its own temp file.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump({field: getattr(self, field) for field in self.FIELDS}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def is_line_boundary(path, offset):
+    """True if offset is 0 or sits right after a newline in the file"""
+    if offset == 0:
+        return True
+    with open(path, 'rb') as file:
+        file.seek(offset - 1)
+        return file.read(1) == b'\n'
+
+
+class CSVLogReader:
+    """Follows a CSV log, reading only what was appended.
+
+    Rows are handed to the caller rather than kept: only the byte offset,
+    file identity (device/inode, mtime) and row count of the last read are
+    remembered. refresh() checks the log and starts over from the top when
+    it was truncated, rotated or rewritten, bumping generation; tail() then
+    yields the rows added since the last read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.offset = 0
+        self.identity = None
+        self.mtime = None
+        self.generation = 0
+
+    def reset(self):
+        self.count = 0
+        self.offset = 0
+        self.identity = None
+        self.mtime = None
+        self.generation += 1
+
+    def refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.identity is not None:
+                self.reset()
+            return
+
+        identity = (stat.st_dev, stat.st_ino)
+        if self.identity is not None:
+            if (identity != self.identity
+                    or stat.st_size < self.offset
+                    or (stat.st_size == self.offset and stat.st_mtime_ns != self.mtime)
+                    or not is_line_boundary(self.path, self.offset)):
+                self.reset()
+        self.identity = identity
+        self.mtime = stat.st_mtime_ns
+
+    def tail(self):
+        if self.identity is None:
+            return
+        tail = CSVTail(self.path, self.offset)
+        for row in tail:
+            self.count += 1
+            self.offset = tail.offset
+            yield row
+        self.offset = tail.offset
+
+
+class Segment:
+    """A sealed month of a CSV log, as described by its footer"""
+
+    def __init__(self, path, count, total, min, max, sum_sq, first, last, data_length):
+        self.path = path
+        self.count = count
+        self.total = total
+        self.min = min
+        self.max = max
+        self.sum_sq = sum_sq
+        self.first = first
+        self.last = last
+        self.data_length = data_length
+
+    @classmethod
+    def write(cls, path, rows):
+        """Compresses rows (oldest first) into a new segment file, atomically"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
+        data = gzip.compress(buffer.getvalue().encode('utf-8'), mtime=0)
+
+        aggregate = SessionAggregate()
+        for _, _, duration in rows:
+            aggregate.add(duration)
+        starts = [row[0] for row in rows]
+        footer = SEGMENT_FOOTER.pack(
+            SEGMENT_MAGIC, aggregate.count, aggregate.total, aggregate.min, aggregate.max,
+            aggregate.sum_sq, min(starts).encode('ascii'), max(starts).encode('ascii'), len(data)
+        )
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+            file.write(footer)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        return cls.read(path)
+
+    @classmethod
+    def read(cls, path):
+        """Reads only the footer; returns None for a damaged segment"""
+        try:
+            with open(path, 'rb') as file:
+                file.seek(-SEGMENT_FOOTER.size, os.SEEK_END)
+                footer = file.read(SEGMENT_FOOTER.size)
+            magic, count, total, low, high, sum_sq, first, last, data_length = SEGMENT_FOOTER.unpack(footer)
+        except (OSError, struct.error):
+            return None
+        if magic != SEGMENT_MAGIC:
+            return None
+        return cls(path, count, total, low, high, sum_sq,
+                   first.decode('ascii'), last.decode('ascii'), data_length)
+
+    def aggregate(self):
+        return SessionAggregate(self.count, self.total, self.min, self.max, self.sum_sq)
+
+    def rows(self):
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        """Yields the month's sessions, decompressing as it goes"""
+        with open(self.path, 'rb') as file:
+            data = file.read(self.data_length)
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as compressed:
+            csv_reader = csv.reader(io.TextIOWrapper(compressed, encoding='utf-8', newline=''))
+            next(csv_reader, None)  # Skip header
+            yield from parse_csv_rows(csv_reader)
+
+    def overlaps(self, start, end):
+        return self.first <= end and self.last >= start
+
+    def within(self, start, end):
+        return start <= self.first and self.last <= end
+
+
+class CSVSessionStore:
+    """Append-only text log, one row per session (the original format).
+
+    The log is rotated by month: when a session from a new month is
+    appended, earlier months are sealed into compressed segments in
+    segments/ next to the log, and the log itself (the active segment)
+    starts over. Totals read only segment footers, and range queries
+    decompress only the sealed months they touch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.aggregate_path = path + '.stats'
+        self.reader = CSVLogReader(path)
+        self.segment_dir = os.path.join(os.path.dirname(path), SEGMENT_DIR)
+        self.segment_prefix = os.path.splitext(os.path.basename(path))[0] + '-'
+        self.segment_cache = {}
+
+    def exists(self):
+        return os.path.exists(self.path) or bool(self.segments())
+
+    def reopen(self):
+        """A separate store on the same log, e.g. for a loader thread"""
+        return CSVSessionStore(self.path)
+
+    def segments(self):
+        """Sealed segments, oldest first. Footers are cached per file."""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.segment_dir)
+                if entry.name.startswith(self.segment_prefix) and entry.name.endswith(SEGMENT_SUFFIX)
+            ]
+        except FileNotFoundError:
+            return []
+
+        segments = []
+        for entry in entries:
+            stat = entry.stat()
+            key = (entry.path, stat.st_size, stat.st_mtime_ns)
+            if key not in self.segment_cache:
+                self.segment_cache[key] = Segment.read(entry.path)
+            if self.segment_cache[key] is not None:
+                segments.append(self.segment_cache[key])
+        return sorted(segments, key=lambda segment: (segment.first, segment.path))
+
+    def active_month(self):
+        """'YYYY-MM' of the first session in the active log, or None"""
+        try:
+            with open(self.path, 'r', newline='') as file:
+                csv_reader = csv.reader(file)
+                next(csv_reader, None)  # Skip header
+                for row in parse_csv_rows(csv_reader):
+                    return row[0][:7]
+        except FileNotFoundError:
+            pass
+        return None
+
+    def rotate(self, before=None):
+        """Seals every active session that started before month `before`
+        ('YYYY-MM'; default: the newest session's month) into one
+        compressed segment per month. Returns the number sealed."""
+        rows = list(self.iter_active())
+        if not rows:
+            return 0
+        before = before or max(row[0][:7] for row in rows)
+        by_month = defaultdict(list)
+        keep = []
+        for row in rows:
+            month = row[0][:7]
+            (by_month[month] if month < before else keep).append(row)
+        if not by_month:
+            return 0
+
+        os.makedirs(self.segment_dir, exist_ok=True)
+        existing = self.segments()
+        for month, month_rows in sorted(by_month.items()):
+            starts = [row[0] for row in month_rows]
+            # Sealed already by a rotation that was interrupted before it
+            # could rewrite the active log
+            if any(segment.count == len(month_rows) and segment.first == min(starts)
+                   and segment.last == max(starts) for segment in existing):
+                continue
+            name = f"{self.segment_prefix}{month}"
+            path = os.path.join(self.segment_dir, name + SEGMENT_SUFFIX)
+            sequence = 1
+            while os.path.exists(path):
+                path = os.path.join(self.segment_dir, f"{name}.{sequence}{SEGMENT_SUFFIX}")
+                sequence += 1
+            Segment.write(path, month_rows)
+
+        # Start the active log over with whatever stays in it
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(keep)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        aggregate = SessionAggregate()
+        aggregate.catch_up(self.path)
+        aggregate.save(self.aggregate_path)
+        return len(rows) - len(keep)
+
+    def append(self, start, end, duration):
+        month = self.active_month()
+        if month is not None and month < start[:7]:
+            self.rotate(start[:7])
+
+        aggregate = self.active_aggregate()
+        file_exists = os.path.exists(self.path)
+        with open(self.path, 'a', newline='') as file:
+            writer = csv.writer(file)
+            if not file_exists:
+                writer.writerow(CSV_HEADER)
+            writer.writerow([start, end, duration])
+        aggregate.catch_up(self.path)
+        aggregate.save(self.aggregate_path)
+
+    def aggregate(self):
+        """Totals over sealed segments (from their footers) and the active log"""
+        aggregate = SessionAggregate()
+        for segment in self.segments():
+            aggregate.merge(segment.aggregate())
+        return aggregate.merge(self.active_aggregate())
+
+    def active_aggregate(self):
+        """Returns up-to-date totals of the active log, reading the sidecar
+        in O(1) when current.
+
+        A sidecar that lags behind the log only has the new tail folded in;
+        one that is corrupt, ahead of the log (truncated) or taken from
+        another file (replaced or rewritten, by inode and mtime) is rebuilt
+        from scratch.
+        """
+        aggregate = SessionAggregate.load(self.aggregate_path)
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return SessionAggregate()
+
+        if aggregate is not None and aggregate.offset == stat.st_size and aggregate.matches(stat):
+            return aggregate
+        if (aggregate is None or aggregate.offset > stat.st_size or not aggregate.matches(stat)
+                or not is_line_boundary(self.path, aggregate.offset)):
+            aggregate = SessionAggregate()
+
+        aggregate.catch_up(self.path)
+        try:
+            aggregate.save(self.aggregate_path)
+        except OSError:
+            pass  # Read-only location; totals are still correct for this call
+        return aggregate
+
+    def iter_active(self):
+        """Yields the active log's sessions in file (append) order"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', newline='') as file:
+            csv_reader = csv.reader(file)
+            next(csv_reader, None)  # Skip header
+            yield from parse_csv_rows(csv_reader)
+
+    def iter_sessions(self):
+        """Yields sessions month by month, then the active log in append order"""
+        for segment in self.segments():
+            yield from segment.iter_rows()
+        yield from self.iter_active()
+
+    def sessions(self, newest_first=True):
+        return sorted(self.iter_sessions(), key=lambda row: row[0], reverse=newest_first)
+
+    def changes_since(self, cursor, chunk_size=CHANGES_CHUNK):
+        """Yields (sessions, cursor, reloaded) chunks of what was logged
+        since a cursor, so the caller can fold them in as they are read.
+
+        Pass None to get every session. When reloaded is True (only ever on
+        the first chunk) the sessions replace, rather than extend, what the
+        caller already has. At least one, possibly empty, chunk is yielded;
+        the cursor to pass next time comes with the last one (earlier chunks
+        carry None).
+        """
+        self.reader.refresh()
+        segments = self.segments()
+        sealed_key = tuple(segment.path for segment in segments)
+        sealed_count = sum(segment.count for segment in segments)
+        if (cursor is None or cursor[0] != (self.reader.generation, sealed_key)
+                or cursor[1] != sealed_count + self.reader.count):
+            # Start the active log over too, so every session is read
+            self.reader.reset()
+            self.reader.refresh()
+            rows = itertools.chain(
+                itertools.chain.from_iterable(segment.iter_rows() for segment in segments),
+                self.reader.tail()
+            )
+            reloaded = True
+        else:
+            rows, reloaded = self.reader.tail(), False
+
+        pending = []
+        for chunk in chunked(rows, chunk_size):
+            if pending:
+                yield pending, None, reloaded
+                reloaded = False
+            pending = chunk
+        cursor = ((self.reader.generation, sealed_key), sealed_count + self.reader.count)
+        yield pending, cursor, reloaded
+
+    def summary(self):
+        """Returns (session count, total duration in seconds)"""
+        aggregate = self.aggregate()
+        return aggregate.count, aggregate.total
+
+    def newest(self, n):
+        """Newest n sessions; sealed months are only opened while they can
+        still hold one of them"""
+        if n <= 0:
+            return []
+        rows = list(self.iter_active())
+        for segment in sorted(self.segments(), key=lambda segment: segment.last, reverse=True):
+            if len(rows) >= n and segment.last < sorted(row[0] for row in rows)[-n]:
+                break
+            rows.extend(segment.rows())
+        return sorted(rows, key=lambda row: row[0], reverse=True)[:n]
+
+    def in_range(self, start, end):
+        """Sessions whose start falls in [start, end], oldest first"""
+        rows = []
+        for segment in self.segments():
+            if segment.overlaps(start, end):
+                rows.extend(row for row in segment.rows() if start <= row[0] <= end)
+        rows.extend(row for row in self.iter_active() if start <= row[0] <= end)
+        return sorted(rows, key=lambda row: row[0])
+
+    def count_in_range(self, start, end):
+        count = 0
+        for segment in self.segments():
+            if segment.within(start, end):
+                count += segment.count
+            elif segment.overlaps(start, end):
+                count += sum(1 for row in segment.rows() if start <= row[0] <= end)
+        return count + sum(1 for row in self.iter_active() if start <= row[0] <= end)
+
+    def close(self):
+        pass
+
+
+class SQLiteSessionStore:
+    """SQLite log indexed on session start.
+
+    Timestamps are stored in TIME_FORMAT, which sorts lexicographically, so
+    the start index serves range and newest-N queries directly. Totals are
+    kept in a one-row summary table maintained by a trigger, so they never
+    need a table scan.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            start TEXT NOT NULL,
+            end TEXT NOT NULL,
+            duration INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start);
+        CREATE TABLE IF NOT EXISTS summary (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            count INTEGER NOT NULL,
+            total INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO summary (id, count, total) VALUES (0, 0, 0);
+        CREATE TRIGGER IF NOT EXISTS sessions_summary AFTER INSERT ON sessions
+        BEGIN
+            UPDATE summary SET count = count + 1, total = total + NEW.duration WHERE id = 0;
+        END;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        import sqlite3  # Only the SQLite backend needs it; keeps startup lean
+        # A store may be handed from a loader thread to the UI thread; it is
+        # never used from two threads at once
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+
+    def exists(self):
+        return self.summary()[0] > 0
+
+    def reopen(self):
+        """A separate store on the same database, e.g. for a loader thread"""
+        return SQLiteSessionStore(self.path)
+
+    def append(self, start, end, duration):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sessions (start, end, duration) VALUES (?, ?, ?)",
+                (start, end, int(duration))
+            )
+
+    def append_many(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO sessions (start, end, duration) VALUES (?, ?, ?)",
+                rows
+            )
+
+    def iter_sessions(self):
+        """Yields sessions in insertion order"""
+        yield from self.conn.execute("SELECT start, end, duration FROM sessions ORDER BY id")
+
+    def sessions(self, newest_first=True):
+        order = "DESC" if newest_first else "ASC"
+        return self.conn.execute(
+            f"SELECT start, end, duration FROM sessions ORDER BY start {order}"
+        ).fetchall()
+
+    def changes_since(self, cursor, chunk_size=CHANGES_CHUNK):
+        """Yields (sessions, cursor, reloaded) chunks; see CSVSessionStore"""
+        last_id = cursor[1] if cursor is not None else 0
+        reloaded = cursor is None
+        pending = []
+        while True:
+            # One query per chunk, fully fetched: a statement left open
+            # between chunks would hold a read lock and block appends
+            chunk = self.conn.execute(
+                "SELECT id, start, end, duration FROM sessions WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            ).fetchall()
+            if not chunk:
+                break
+            if pending:
+                yield [row[1:] for row in pending], None, reloaded
+                reloaded = False
+            pending = chunk
+            last_id = chunk[-1][0]
+        yield [row[1:] for row in pending], (0, last_id), reloaded
+
+    def summary(self):
+        return self.conn.execute("SELECT count, total FROM summary WHERE id = 0").fetchone()
+
+    def aggregate(self):
+        count, total, low, high, sum_sq = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(duration), 0), MIN(duration), MAX(duration), "
+            "COALESCE(SUM(duration * duration), 0) FROM sessions"
+        ).fetchone()
+        return SessionAggregate(count, total, low, high, sum_sq)
+
+    def newest(self, n):
+        return self.conn.execute(
+            "SELECT start, end, duration FROM sessions ORDER BY start DESC LIMIT ?", (n,)
+        ).fetchall()
+
+    def in_range(self, start, end):
+        return self.conn.execute(
+            "SELECT start, end, duration FROM sessions WHERE start BETWEEN ? AND ? ORDER BY start",
+            (start, end)
+        ).fetchall()
+
+    def count_in_range(self, start, end):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE start BETWEEN ? AND ?", (start, end)
+        ).fetchone()[0]
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_csv_to_sqlite(csv_path, store):
+    """One-time import of an existing CSV log into a SQLite store.
+
+    Returns the number of imported sessions; 0 if the CSV is missing or
+    has already been migrated into this store.
+    """
+    if not os.path.exists(csv_path) or store.get_meta('migrated_from'):
+        return 0
+
+    rows = list(CSVSessionStore(csv_path).iter_sessions())
+    # One transaction, so a crash can't leave the rows in without the marker
+    # (and have them imported a second time on the next open)
+    with store.conn:
+        store.conn.executemany("INSERT INTO sessions (start, end, duration) VALUES (?, ?, ?)", rows)
+        store.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            ('migrated_from', os.path.abspath(csv_path))
+        )
+    return len(rows)
+
+
+def export_csv(store, path):
+    """Writes every session in the store to a CSV file in the original format"""
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for row in store.sessions(newest_first=False):
+            writer.writerow(row)
+
+
+def open_session_store(log_dir, backend=None):
+    """Opens the session store for a log directory.
+
+    The backend is 'csv' or 'sqlite'; it defaults to the value of the
+    GUITAR_PRACTICE_LOG_BACKEND environment variable, then to 'csv'. The
+    first time the SQLite backend is opened next to an existing CSV log,
+    that log is migrated into it.
+    """
+    backend = backend or os.environ.get(BACKEND_ENV_VAR, DEFAULT_BACKEND)
+    csv_path = os.path.join(log_dir, "session_log.csv")
+
+    if backend == 'csv':
+        return CSVSessionStore(csv_path)
+    if backend == 'sqlite':
+        store = SQLiteSessionStore(os.path.join(log_dir, "session_log.db"))
+        migrate_csv_to_sqlite(csv_path, store)
+        return store
+    raise ValueError(f"Unknown session store backend: {backend}")